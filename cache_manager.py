@@ -1,8 +1,10 @@
 
 import time
+import math
 import hashlib
 import json
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Callable, Awaitable
 
 class LightweightCache:
     def __init__(self, max_size: int = 100, default_ttl: int = 3600):
@@ -35,5 +37,106 @@ class LightweightCache:
         combined = json.dumps(args, sort_keys=True)
         return hashlib.md5(combined.encode()).hexdigest()
 
+class SemanticCache:
+    """Response cache with exact-match lookup and embedding-similarity fallback.
+
+    Entries are partitioned by scope so that only requests of the same kind
+    (e.g. provider + task type) are ever compared with each other. Pass
+    fuzzy=False for requests whose answer depends on every detail of the
+    text (e.g. generated code), so a near match is never served for them.
+    """
+    
+    # Texts longer than this are matched exactly only (embedding input limit)
+    MAX_EMBED_CHARS = 8000
+    # Inputs per embeddings request (OpenAI accepts up to 2048)
+    EMBED_BATCH_SIZE = 2048
+    
+    def __init__(self, embed_fn: Optional[Callable[[List[str]], Awaitable[List[List[float]]]]] = None,
+                 threshold: float = 0.92, max_size: int = 200, default_ttl: int = 3600):
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._exact = LightweightCache(max_size=max_size, default_ttl=default_ttl)
+        # sha256(text) -> unit embedding, least recently used first
+        self._embeddings: "OrderedDict[str, List[float]]" = OrderedDict()
+        self.max_embeddings = max_size * 4
+        self._entries: List[Dict] = []
+    
+    async def get(self, text: str, scope: str = "", fuzzy: bool = True) -> Optional[Any]:
+        key = self._exact.cache_key(scope, text)
+        value = self._exact.get(key)
+        if value is not None or not fuzzy:
+            return value
+        
+        embedding = (await self.embed_many([text]))[0]
+        if embedding is None:
+            return None
+        
+        now = time.time()
+        self._entries = [e for e in self._entries if e['expires'] > now]
+        
+        best_value, best_score = None, self.threshold
+        for entry in self._entries:
+            if entry['scope'] != scope:
+                continue
+            score = sum(a * b for a, b in zip(embedding, entry['embedding']))
+            if score >= best_score:
+                best_value, best_score = entry['value'], score
+        return best_value
+    
+    async def set(self, text: str, value: Any, scope: str = "", ttl: int = None, fuzzy: bool = True):
+        key = self._exact.cache_key(scope, text)
+        self._exact.set(key, value, ttl)
+        if not fuzzy:
+            return
+        
+        embedding = (await self.embed_many([text]))[0]
+        if embedding is None:
+            return
+        
+        if len(self._entries) >= self.max_size:
+            self._entries.pop(0)
+        self._entries.append({
+            'scope': scope,
+            'embedding': embedding,
+            'value': value,
+            'expires': time.time() + (ttl or self.default_ttl)
+        })
+    
+    async def embed_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Return unit-length embeddings for texts, fetching all uncached ones in one batched call"""
+        keys = [hashlib.sha256(text.encode()).hexdigest() for text in texts]
+        
+        if self.embed_fn:
+            missing = {}
+            for key, text in zip(keys, texts):
+                if key not in self._embeddings and key not in missing and len(text) <= self.MAX_EMBED_CHARS:
+                    missing[key] = text
+            
+            missing_keys = list(missing)
+            for start in range(0, len(missing_keys), self.EMBED_BATCH_SIZE):
+                batch = missing_keys[start:start + self.EMBED_BATCH_SIZE]
+                try:
+                    vectors = await self.embed_fn([missing[key] for key in batch])
+                except Exception as e:
+                    # Embedding failures must never break the request path
+                    print(f"⚠️ Embedding request failed, falling back to exact cache matches: {e}")
+                    break
+                for key, vector in zip(batch, vectors):
+                    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+                    self._embeddings[key] = [x / norm for x in vector]
+            
+            while len(self._embeddings) > self.max_embeddings:
+                self._embeddings.popitem(last=False)
+        
+        embeddings = []
+        for key in keys:
+            embedding = self._embeddings.get(key)
+            if embedding is not None:
+                self._embeddings.move_to_end(key)
+            embeddings.append(embedding)
+        return embeddings
+
 # Global cache instance
 cache = LightweightCache()
@@ -1,11 +1,14 @@
 import sqlite3
 import json
+import threading
 import time
 
 class DatabaseManager:
     def __init__(self, db_path: str = "dev_studio.db"):
         self.db_path = db_path
         self._connection = None
+        # Every thread shares one connection, so its transactions can't keep callers apart; this does
+        self._files_lock = threading.Lock()
 
     def get_connection(self):
         """Get database connection with connection reuse"""
@@ -14,6 +17,8 @@ class DatabaseManager:
             self._connection.row_factory = sqlite3.Row
             # Enable WAL mode for better concurrency
             self._connection.execute('PRAGMA journal_mode=WAL')
+            # In WAL mode this only gives up durability of the last commits on power loss, never integrity
+            self._connection.execute('PRAGMA synchronous=NORMAL')
         return self._connection
 
     def init_db(self):
@@ -83,6 +88,20 @@ class DatabaseManager:
             )
         ''')
 
+        # Workspaces table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS workspaces (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                name TEXT NOT NULL,
+                template_name TEXT,
+                tech_stack TEXT,
+                files TEXT,
+                created_at INTEGER NOT NULL,
+                FOREIGN KEY (session_id) REFERENCES sessions (session_id)
+            )
+        ''')
+
         conn.commit()
 
     def get_or_create_session(self, session_id):
@@ -546,19 +565,46 @@ class DatabaseManager:
             kwargs.get('is_ongoing', False)
         )
 
+    def create_workspace(self, session_id, name, template_name, tech_stack, files):
+        """Create a workspace record and return its id"""
+        return self.create_workspace_json(session_id, name, template_name, tech_stack, json.dumps(files))
+
+    def create_workspace_json(self, session_id, name, template_name, tech_stack, files_json):
+        """Create a workspace record from files already serialized to JSON"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            INSERT INTO workspaces (session_id, name, template_name, tech_stack, files, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (session_id, name, template_name, tech_stack, files_json, int(time.time())))
+
+        conn.commit()
+        return cursor.lastrowid
+
     def store_project_file(self, project_id, file_path, content):
         """Store individual project file"""
-        # Get existing project
-        project = self.get_project_by_id(project_id)
-        if project:
-            files = project.get('files', {})
-            files[file_path] = content
-            # Update project with new files
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute('UPDATE projects SET files = ? WHERE id = ?', 
-                         (json.dumps(files), project_id))
-            conn.commit()
+        self.store_project_files(project_id, {file_path: content})
+
+    def store_project_files(self, project_id, new_files):
+        """Store several project files with one read, one write and one commit"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        # Serialize the read-modify-write so a concurrent call can't merge into a stale copy and drop files
+        with self._files_lock:
+            try:
+                cursor.execute('SELECT files FROM projects WHERE id = ?', (project_id,))
+                row = cursor.fetchone()
+                if row:
+                    files = json.loads(row['files']) if row['files'] else {}
+                    files.update(new_files)
+                    cursor.execute('UPDATE projects SET files = ? WHERE id = ?',
+                                 (json.dumps(files), project_id))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
 
     def get_project(self, project_id):
         """Get project by ID"""
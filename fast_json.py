@@ -0,0 +1,24 @@
+
+import json
+
+# orjson is a much faster C serializer; the stdlib covers installs without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps(obj, sort_keys: bool = False) -> str:
+    """Serialize obj to a JSON string"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0).decode()
+        except TypeError:
+            # orjson rejects a few things the stdlib accepts (e.g. non-str keys)
+            pass
+    return json.dumps(obj, sort_keys=sort_keys)
+
+def loads(data):
+    """Parse a JSON str or bytes payload"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -9,7 +9,7 @@ import time
 import sys
 import requests
 import openai
-from flask import Flask, request, jsonify, render_template_string
+from flask import Flask, request, jsonify
 from flask_cors import CORS
 from dotenv import load_dotenv
 
@@ -1113,8 +1113,13 @@ def health_check():
 
 @app.route('/')
 def home():
-    from templates import MINIMAL_TEMPLATE
-    return render_template_string(MINIMAL_TEMPLATE)
+    from templates import get_minimal_template
+    body, encoding = get_minimal_template(request.headers.get('Accept-Encoding', ''))
+    response = app.response_class(body, mimetype='text/html')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
 
 @app.route('/chat', methods=['POST'])
 def chat():
@@ -1258,21 +1263,13 @@ def create_project():
             folder_id=folder_id
         )
 
-        # Store file contents
-        file_paths = ["index.html", ".gitignore"]
-        file_contents = [index_content, gitignore_content]
-
-        for file_path, content in zip(file_paths, file_contents):
-            db_manager.store_project_file(project_id, file_path, content)
-
-        # Create dummy files for testing
-        dummy_files = [
-            {"file_path": "src/App.js", "content": "console.log('Hello React!');"},
-            {"file_path": "api/app.py", "content": "print('Hello Python!');"}
-        ]
-
-        for file_data in dummy_files:
-            db_manager.store_project_file(project_id, file_data["file_path"], file_data["content"])
+        # Store file contents, plus dummy files for testing, in one update
+        db_manager.store_project_files(project_id, {
+            "index.html": index_content,
+            ".gitignore": gitignore_content,
+            "src/App.js": "console.log('Hello React!');",
+            "api/app.py": "print('Hello Python!');"
+        })
 
         return jsonify({
             'success': True,
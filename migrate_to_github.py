@@ -2,10 +2,56 @@
 import os
 import sys
 import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from github import Github
+from github import Github, GithubException
 import requests
 
+# Concurrent metadata requests against the GitHub API
+UPLOAD_WORKERS = 8
+
+# GitHub clients keyed by token, so repeated migrations in one process reuse
+# the same keep-alive connection pool (DNS lookups and TLS sessions included)
+_github_clients = {}
+
+def _get_github_client(github_token):
+    """Return a shared GitHub client whose pool fits UPLOAD_WORKERS threads"""
+    if github_token not in _github_clients:
+        _github_clients[github_token] = Github(github_token, pool_size=UPLOAD_WORKERS)
+    return _github_clients[github_token]
+
+def _fetch_existing_sha(repo, file_path):
+    """Return the blob SHA of file_path in repo, or None if it does not exist yet"""
+    try:
+        return repo.get_contents(file_path).sha
+    except GithubException:
+        return None
+
+def _fetch_tree_shas(repo):
+    """Return {path: blob_sha} for the default branch from a single tree call.
+
+    Returns None when the manifest cannot be trusted (truncated tree or an
+    unexpected API error) so callers can fall back to per-file lookups.
+    """
+    try:
+        branch = repo.get_branch(repo.default_branch)
+        tree = repo.get_git_tree(branch.commit.sha, recursive=True)
+    except GithubException as e:
+        if e.status in (404, 409):
+            # Empty repository: nothing exists yet
+            return {}
+        return None
+    
+    if tree.raw_data.get('truncated'):
+        return None
+    return {entry.path: entry.sha for entry in tree.tree if entry.type == 'blob'}
+
+def git_blob_sha(content):
+    """Compute the git blob SHA GitHub reports for a file with this content"""
+    data = content.encode('utf-8')
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
 def migrate_to_github():
     """Migrate this project to GitHub using environment variables"""
     load_dotenv()
@@ -17,7 +63,7 @@ def migrate_to_github():
     
     try:
         # Initialize GitHub client
-        g = Github(github_token)
+        g = _get_github_client(github_token)
         user = g.get_user()
         
         # Create repository
@@ -60,7 +106,10 @@ def migrate_to_github():
         deployment_files = {
             'requirements.txt': '''flask==2.3.3
 flask-cors==4.0.0
-openai==1.3.0
+openai==1.82.1
+anthropic==0.42.0
+mistralai==0.4.2
+httpx==0.27.2
 PyGithub==1.59.1
 python-dotenv==1.0.0
 requests==2.31.0
@@ -91,20 +140,34 @@ PORT=5000''',
         # Upload files to GitHub
         print(f"📤 Uploading {len(files_to_upload)} files...")
         
+        # One recursive tree listing tells us which files already exist
+        existing_shas = _fetch_tree_shas(repo)
+        if existing_shas is None:
+            # Fall back to probing each file; PyGithub is blocking, so the
+            # lookups are fanned out over a thread pool
+            with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+                existing_shas = dict(zip(
+                    files_to_upload,
+                    executor.map(lambda path: _fetch_existing_sha(repo, path), files_to_upload)
+                ))
+        
+        # Writes stay sequential: every Contents API write is a commit on the
+        # branch head, so concurrent writes would race each other
         for file_path, content in files_to_upload.items():
             try:
-                # Check if file exists
-                try:
-                    existing_file = repo.get_contents(file_path)
+                sha = existing_shas.get(file_path)
+                if sha == git_blob_sha(content):
+                    # Identical content is already on GitHub, skip the upload
+                    print(f"   Unchanged: {file_path}")
+                elif sha:
                     repo.update_file(
                         file_path,
                         f"Update {file_path}",
                         content,
-                        existing_file.sha
+                        sha
                     )
                     print(f"   Updated: {file_path}")
-                except:
-                    # Create new file
+                else:
                     repo.create_file(
                         file_path,
                         f"Add {file_path}",
@@ -84,21 +84,21 @@ def get_ai_consensus():
             context=context
         )
         
-        # Get responses from all available AIs
+        # Get responses from all available AIs at once
+        results = asyncio.run(multi_ai_manager._execute_consensus_tasks([task]))[0]
         responses = []
-        for provider in multi_ai_manager.clients.keys():
-            try:
-                response = asyncio.run(multi_ai_manager._execute_primary_task(provider, task))
+        for provider, response in results.items():
+            if isinstance(response, Exception):
                 responses.append({
                     "provider": provider.value,
-                    "response": response.content,
-                    "confidence": response.confidence,
-                    "reasoning": response.reasoning
+                    "error": str(response)
                 })
-            except Exception as e:
+            else:
                 responses.append({
                     "provider": provider.value,
-                    "error": str(e)
+                    "response": response.content,
+                    "confidence": response.confidence,
+                    "reasoning": response.reasoning
                 })
         
         # Calculate consensus
@@ -1,14 +1,24 @@
 
 import openai
 import anthropic
+import httpx
 import google.generativeai as genai
-from mistralai.client import MistralClient
-from typing import Dict, List, Optional, Any
+from mistralai.async_client import MistralAsyncClient
+from typing import Dict, List, Optional, Any, Callable, Awaitable
 import asyncio
+import functools
+import hashlib
+import importlib.util
 import json
+import os
+import random
+import re
 import time
-from dataclasses import dataclass
+import weakref
+from dataclasses import dataclass, field, replace
 from enum import Enum
+from cache_manager import SemanticCache
+import fast_json
 
 class AIProvider(Enum):
     OPENAI = "openai"
@@ -31,31 +41,268 @@ class AITask:
     description: str
     context: Dict[str, Any]
     priority: int = 1
+    context_json: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Contexts carry whole architectures and code bundles; serialize them once
+        self.context_json = fast_json.dumps(self.context, sort_keys=True)
+
+class AIResponseStream:
+    """Reply text as it streams in, plus the parsed AIResponse once the reply is complete"""
+    
+    def __init__(self):
+        self._chunks: List[str] = []
+        self._length = 0
+        self._changed = asyncio.Event()
+        self._final = asyncio.get_running_loop().create_future()
+        self.task: Optional[asyncio.Future] = None
+    
+    def feed(self, text: str):
+        if text:
+            self._chunks.append(text)
+            self._length += len(text)
+            self._changed.set()
+    
+    def finish(self, response: Optional[AIResponse] = None, error: Optional[BaseException] = None):
+        if self._final.done():
+            return
+        if error is not None:
+            self._final.set_exception(error)
+        else:
+            self._final.set_result(response)
+        self._changed.set()
+    
+    def done(self) -> bool:
+        return self._final.done()
+    
+    def partial(self) -> str:
+        return "".join(self._chunks)
+    
+    async def wait_for(self, n_chars: int) -> str:
+        """Return the text once n_chars have arrived, or the parsed content if the reply completes first"""
+        while self._length < n_chars and not self._final.done():
+            self._changed.clear()
+            await self._changed.wait()
+        
+        if self._final.done() and self._final.exception() is None:
+            return self._final.result().content
+        return self.partial()
+    
+    async def final(self) -> AIResponse:
+        return await self._final
+
+class RateLimitedExecutor:
+    """Caps concurrent and per-minute requests to a provider and retries throttled calls with backoff"""
+    
+    def __init__(self, max_concurrency: int = 10, rpm: int = 600, max_retries: int = 4, base_delay: float = 1.0):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._lock = asyncio.Lock()
+        self.rate = rpm / 60.0
+        # Token bucket allowing at most one second's worth of requests in a burst
+        self.capacity = max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+    
+    async def run(self, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Await factory() within the limits, retrying when the provider answers 429"""
+        for attempt in range(self.max_retries + 1):
+            await self._take_token()
+            async with self._semaphore:
+                try:
+                    return await factory()
+                except Exception as e:
+                    if attempt == self.max_retries or not self._is_rate_limited(e):
+                        raise
+            
+            delay = self.base_delay * (2 ** attempt) * (1 + random.random() * 0.25)
+            print(f"⏳ Rate limited, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+    
+    async def _take_token(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+    
+    def _is_rate_limited(self, error: Exception) -> bool:
+        if isinstance(error, (openai.RateLimitError, anthropic.RateLimitError)):
+            return True
+        # Gemini and Mistral surface the HTTP status under different attribute names
+        return any(getattr(error, attr, None) == 429 for attr in ('status_code', 'code', 'http_status'))
+
+class ProviderScoreboard:
+    """Live latency, token and success stats per provider and task type, used for routing"""
+    
+    QUALITY_WEIGHT = 2.0
+    LATENCY_WEIGHT = 1.0
+    COST_WEIGHT = 0.5
+    
+    def __init__(self, path: Optional[str] = None, min_samples: int = 3, decay: float = 0.2):
+        self.path = path
+        self.min_samples = min_samples
+        self.decay = decay  # Weight of the newest sample in the moving averages
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._load()
+    
+    def record(self, provider: AIProvider, task_type: str, duration: float, tokens: int, ok: bool):
+        """Fold one provider call into the moving averages"""
+        key = f"{provider.value}:{task_type}"
+        stats = self._stats.get(key)
+        
+        if stats is None:
+            stats = self._stats[key] = {
+                'samples': 0,
+                'latency': duration,
+                'tokens': float(tokens),
+                'success': 1.0 if ok else 0.0
+            }
+        else:
+            stats['success'] += self.decay * ((1.0 if ok else 0.0) - stats['success'])
+            if ok:
+                # Failed calls say nothing about latency or token cost
+                stats['latency'] += self.decay * (duration - stats['latency'])
+                stats['tokens'] += self.decay * (tokens - stats['tokens'])
+        
+        stats['samples'] += 1
+        self._save()
+    
+    def live_scores(self, providers, task_type: str) -> Dict[AIProvider, float]:
+        """Return a routing adjustment for each warm provider; empty while the board is cold"""
+        warm = {}
+        for provider in providers:
+            stats = self._stats.get(f"{provider.value}:{task_type}")
+            if stats and stats['samples'] >= self.min_samples:
+                warm[provider] = stats
+        
+        if not warm:
+            return {}
+        
+        max_latency = max(s['latency'] for s in warm.values()) or 1.0
+        max_tokens = max(s['tokens'] for s in warm.values()) or 1.0
+        
+        return {
+            provider: (self.QUALITY_WEIGHT * s['success']
+                       - self.LATENCY_WEIGHT * s['latency'] / max_latency
+                       - self.COST_WEIGHT * s['tokens'] / max_tokens)
+            for provider, s in warm.items()
+        }
+    
+    def _load(self):
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    self._stats = json.load(f)
+            except (OSError, ValueError):
+                self._stats = {}
+    
+    def _save(self):
+        if self.path:
+            try:
+                with open(self.path, 'w') as f:
+                    json.dump(self._stats, f)
+            except OSError:
+                pass
 
 class MultiAIManager:
-    def __init__(self, api_keys: Dict[str, str]):
+    # Task types whose paraphrased repeats may share a cached answer; every other
+    # task generates or reviews project-specific code and must match exactly
+    FUZZY_CACHE_TASK_TYPES = frozenset({"consensus_question"})
+    
+    def __init__(self, api_keys: Dict[str, str], use_batch_api: bool = False, batch_poll_interval: float = 10.0,
+                 speculative_architecture: bool = True, speculation_min_confidence: float = 0.7,
+                 scoreboard_path: Optional[str] = None, early_dispatch_chars: Optional[int] = None,
+                 max_concurrency: int = 10, requests_per_minute: int = 600):
         self.api_keys = api_keys
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.scoreboard = ProviderScoreboard(scoreboard_path)
+        # Race architecture drafts across providers; costs extra tokens, saves latency
+        self.speculative_architecture = speculative_architecture
+        self.speculation_min_confidence = speculation_min_confidence
+        # Start phase 2 once this much architecture text has streamed in (None waits for all of it)
+        self.early_dispatch_chars = early_dispatch_chars
+        if early_dispatch_chars and speculative_architecture:
+            # Phase 2 builds on one provider's partial stream, so there are no finished drafts to race
+            print("⚠️ early_dispatch_chars is set, so the speculative architecture race is skipped")
+        # Provider batch jobs are half price but may take hours; opt-in only
+        self.use_batch_api = use_batch_api
+        self.batch_poll_interval = batch_poll_interval
         self.clients = self._initialize_clients()
+        # Pooled HTTP connections are bound to the event loop that opened them,
+        # so each loop (e.g. one asyncio.run per request) gets its own clients
+        self._loop_clients = weakref.WeakKeyDictionary()
+        self._init_clients_adopted = False
+        self._loop_executors = weakref.WeakKeyDictionary()
+        # Identical requests currently on the wire: (loop, key) -> shared task and waiter count
+        self._inflight: Dict[Any, Dict[str, Any]] = {}
         self.ai_specializations = self._define_specializations()
+        # Specializations and connected clients are fixed, so score each task type once
+        self._specialization_scores: Dict[str, Dict[AIProvider, int]] = {}
+        self.response_cache = SemanticCache(
+            embed_fn=self._embed_texts if AIProvider.OPENAI in self.clients else None
+        )
         
     def _initialize_clients(self):
         clients = {}
         
         if self.api_keys.get('openai'):
-            clients[AIProvider.OPENAI] = openai.OpenAI(api_key=self.api_keys['openai'])
+            clients[AIProvider.OPENAI] = openai.AsyncOpenAI(
+                api_key=self.api_keys['openai'],
+                http_client=self._build_http_client()
+            )
             
         if self.api_keys.get('anthropic'):
-            clients[AIProvider.ANTHROPIC] = anthropic.Anthropic(api_key=self.api_keys['anthropic'])
+            clients[AIProvider.ANTHROPIC] = anthropic.AsyncAnthropic(
+                api_key=self.api_keys['anthropic'],
+                http_client=self._build_http_client()
+            )
             
         if self.api_keys.get('gemini'):
             genai.configure(api_key=self.api_keys['gemini'])
             clients[AIProvider.GEMINI] = genai.GenerativeModel('gemini-pro')
             
         if self.api_keys.get('mistral'):
-            clients[AIProvider.MISTRAL] = MistralClient(api_key=self.api_keys['mistral'])
+            # The async client keeps its own persistent httpx pool
+            clients[AIProvider.MISTRAL] = MistralAsyncClient(api_key=self.api_keys['mistral'])
             
         return clients
     
+    def _build_http_client(self) -> httpx.AsyncClient:
+        """Create a keep-alive connection pool reused by every call to a provider"""
+        return httpx.AsyncClient(
+            http2=importlib.util.find_spec('h2') is not None,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60),
+            timeout=httpx.Timeout(600.0, connect=10.0)
+        )
+    
+    def _client(self, provider: AIProvider):
+        """Return the provider client whose connection pool belongs to the running event loop"""
+        loop = asyncio.get_running_loop()
+        clients = self._loop_clients.get(loop)
+        if clients is None:
+            if not self._init_clients_adopted:
+                # The first loop adopts the clients built in __init__
+                clients = self.clients
+                self._init_clients_adopted = True
+            else:
+                clients = self._initialize_clients()
+            self._loop_clients[loop] = clients
+        return clients[provider]
+    
+    def _executor(self, provider: AIProvider) -> RateLimitedExecutor:
+        """Return the running loop's rate limiter for a provider"""
+        executors = self._loop_executors.setdefault(asyncio.get_running_loop(), {})
+        if provider not in executors:
+            executors[provider] = RateLimitedExecutor(self.max_concurrency, self.requests_per_minute)
+        return executors[provider]
+    
     def _define_specializations(self):
         """Define what each AI is best at"""
         return {
@@ -80,24 +327,25 @@ class MultiAIManager:
     async def collaborative_code_generation(self, project_description: str, tech_stack: str) -> Dict[str, Any]:
         """Generate code using multiple AIs collaboratively"""
         
-        # Phase 1: Architecture Design (OpenAI leads)
+        # Phase 1: Architecture Design (OpenAI leads, Anthropic drafts speculatively)
         architecture_task = AITask(
             task_type="architecture_design",
             description=f"Design system architecture for: {project_description}",
             context={"tech_stack": tech_stack, "project_description": project_description}
         )
         
-        architecture = await self._execute_primary_task(AIProvider.OPENAI, architecture_task)
-        
-        # Phase 2: Parallel code generation
-        tasks = [
-            AITask("frontend_code", "Generate frontend components", {"architecture": architecture.content}),
-            AITask("backend_code", "Generate backend services", {"architecture": architecture.content}),
-            AITask("database_design", "Design database schema", {"architecture": architecture.content}),
-            AITask("api_design", "Design API endpoints", {"architecture": architecture.content})
-        ]
-        
-        responses = await self._execute_parallel_tasks(tasks)
+        drafters = [p for p in (AIProvider.OPENAI, AIProvider.ANTHROPIC) if p in self.clients]
+        if self.early_dispatch_chars:
+            # Phase 2 starts on the streamed draft while the architecture finishes; takes precedence over speculation
+            architecture, responses = await self._execute_with_early_dispatch(AIProvider.OPENAI, architecture_task)
+        else:
+            if self.speculative_architecture and len(drafters) > 1:
+                architecture = await self._execute_speculative_task(drafters, architecture_task)
+            else:
+                architecture = await self._execute_primary_task(AIProvider.OPENAI, architecture_task)
+            
+            # Phase 2: Parallel code generation
+            responses = await self._execute_parallel_tasks(self._code_generation_tasks(architecture.content))
         
         # Phase 3: Code review and optimization
         combined_code = self._combine_responses(responses)
@@ -119,24 +367,150 @@ class MultiAIManager:
             "collaboration_summary": self._generate_collaboration_summary(responses, reviews)
         }
     
-    async def _execute_primary_task(self, provider: AIProvider, task: AITask) -> AIResponse:
-        """Execute a primary task with a specific AI"""
+    def _code_generation_tasks(self, architecture: str) -> List[AITask]:
+        """Phase 2 tasks that build on the architecture design"""
+        return [
+            AITask("frontend_code", "Generate frontend components", {"architecture": architecture}),
+            AITask("backend_code", "Generate backend services", {"architecture": architecture}),
+            AITask("database_design", "Design database schema", {"architecture": architecture}),
+            AITask("api_design", "Design API endpoints", {"architecture": architecture})
+        ]
+    
+    async def _execute_with_early_dispatch(self, provider: AIProvider, task: AITask):
+        """Run the architecture task, launching phase 2 as soon as enough of it has streamed"""
+        stream = self._stream_primary_task(provider, task)
+        draft = await stream.wait_for(self.early_dispatch_chars)
+        phase2 = asyncio.ensure_future(self._execute_parallel_tasks(self._code_generation_tasks(draft)))
+        
+        try:
+            architecture = await stream.final()
+        except Exception:
+            phase2.cancel()
+            raise
+        return architecture, await phase2
+    
+    def _stream_primary_task(self, provider: AIProvider, task: AITask) -> AIResponseStream:
+        """Start a primary task in the background and return a stream of its reply text"""
+        stream = AIResponseStream()
+        
+        async def run():
+            try:
+                stream.finish(await self._execute_primary_task(provider, task, on_text=stream.feed))
+            except Exception as e:
+                stream.finish(error=e)
+        
+        stream.task = asyncio.ensure_future(run())
+        return stream
+    
+    async def _execute_primary_task(self, provider: AIProvider, task: AITask,
+                                    on_text: Optional[Callable[[str], None]] = None) -> AIResponse:
+        """Execute a primary task with a specific AI, serving repeats from the response cache"""
         if provider not in self.clients:
             raise ValueError(f"Provider {provider} not available")
         
+        scope, cache_text = self._cache_key(provider, task)
+        
+        cached = await self.response_cache.get(cache_text, scope, fuzzy=self._cache_fuzzy(task))
+        if cached is not None:
+            return replace(cached, execution_time=0.0)
+        
+        # Callers asking for the same thing concurrently share one request
+        key = hashlib.sha256(f"{scope}\n{cache_text}".encode()).hexdigest()
+        return await self._coalesce(key, lambda: self._query_and_cache(provider, task, scope, cache_text, on_text))
+    
+    async def _query_and_cache(self, provider: AIProvider, task: AITask, scope: str, cache_text: str,
+                               on_text: Optional[Callable[[str], None]] = None) -> AIResponse:
+        response = await self._query_provider(provider, task, on_text)
+        await self.response_cache.set(cache_text, response, scope, fuzzy=self._cache_fuzzy(task))
+        return response
+    
+    async def _coalesce(self, key: str, factory):
+        """Await the in-flight request for key, starting it via factory if there is none"""
+        loop = asyncio.get_running_loop()
+        inflight_key = (loop, key)
+        entry = self._inflight.get(inflight_key)
+        
+        if entry is None:
+            entry = {'task': asyncio.ensure_future(factory()), 'waiters': 0}
+            self._inflight[inflight_key] = entry
+            entry['task'].add_done_callback(lambda _: self._inflight.pop(inflight_key, None))
+        
+        shared = entry['task']
+        entry['waiters'] += 1
+        try:
+            return await asyncio.shield(shared)
+        finally:
+            entry['waiters'] -= 1
+            if entry['waiters'] == 0 and not shared.done():
+                # Every caller gave up, so stop the request itself
+                shared.cancel()
+    
+    async def _execute_speculative_task(self, providers: List[AIProvider], task: AITask) -> AIResponse:
+        """Race a task across providers and keep the first sufficiently confident answer"""
+        pending = {asyncio.create_task(self._execute_primary_task(provider, task)) for provider in providers}
+        best = None
+        error = None
+        
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for finished in done:
+                    if finished.exception():
+                        error = finished.exception()
+                        continue
+                    response = finished.result()
+                    if best is None or response.confidence > best.confidence:
+                        best = response
+                
+                if best and best.confidence >= self.speculation_min_confidence:
+                    break
+        finally:
+            # Cancel the losing drafts so their requests stop immediately
+            for loser in pending:
+                loser.cancel()
+        
+        if best is None:
+            raise error
+        return best
+    
+    def _cache_key(self, provider: AIProvider, task: AITask):
+        """Return the (scope, text) pair identifying a task in the response cache"""
+        scope = f"{provider.value}:{task.task_type}"
+        cache_text = f"{task.description}\n\n{task.context_json}"
+        return scope, cache_text
+    
+    def _cache_fuzzy(self, task: AITask) -> bool:
+        """Whether a task may be answered from a merely similar cached request"""
+        return task.task_type in self.FUZZY_CACHE_TASK_TYPES
+    
+    async def _query_provider(self, provider: AIProvider, task: AITask,
+                              on_text: Optional[Callable[[str], None]] = None) -> AIResponse:
+        """Send a task to a specific AI and time the round-trip; on_text receives streamed text"""
         start_time = time.time()
         
+        try:
+            response = await self._executor(provider).run(lambda: self._dispatch_query(provider, task, on_text))
+        except Exception:
+            self.scoreboard.record(provider, task.task_type, time.time() - start_time, 0, ok=False)
+            raise
+        
+        result = self._build_response(provider, response, time.time() - start_time)
+        self.scoreboard.record(provider, task.task_type, result.execution_time, result.tokens_used, ok=True)
+        return result
+    
+    async def _dispatch_query(self, provider: AIProvider, task: AITask,
+                              on_text: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         if provider == AIProvider.OPENAI:
-            response = await self._query_openai(task)
+            return await self._query_openai(task, on_text)
         elif provider == AIProvider.ANTHROPIC:
-            response = await self._query_anthropic(task)
+            return await self._query_anthropic(task, on_text)
         elif provider == AIProvider.GEMINI:
-            response = await self._query_gemini(task)
+            return await self._query_gemini(task)
         elif provider == AIProvider.MISTRAL:
-            response = await self._query_mistral(task)
-        
-        execution_time = time.time() - start_time
-        
+            return await self._query_mistral(task)
+    
+    def _build_response(self, provider: AIProvider, response: Dict[str, Any], execution_time: float) -> AIResponse:
+        """Wrap a parsed provider reply in an AIResponse"""
         return AIResponse(
             provider=provider,
             content=response['content'],
@@ -146,6 +520,19 @@ class MultiAIManager:
             tokens_used=response.get('tokens_used', 0)
         )
     
+    async def _prewarm_embeddings(self, assignments: List[tuple]):
+        """Embed every task's cache text in one request before the tasks fan out"""
+        await self.response_cache.embed_many([self._cache_key(provider, task)[1] for provider, task in assignments
+                                              if self._cache_fuzzy(task)])
+    
+    async def _embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts with OpenAI for the semantic response cache"""
+        response = await self._client(AIProvider.OPENAI).embeddings.create(
+            model="text-embedding-3-small",
+            input=texts
+        )
+        return [item.embedding for item in response.data]
+    
     async def _execute_parallel_tasks(self, tasks: List[AITask]) -> List[AIResponse]:
         """Execute multiple tasks in parallel using best-suited AIs"""
         task_assignments = []
@@ -154,39 +541,204 @@ class MultiAIManager:
             best_provider = self._select_best_provider(task)
             task_assignments.append((best_provider, task))
         
-        # Execute all tasks concurrently
-        responses = await asyncio.gather(*[
-            self._execute_primary_task(provider, task) 
-            for provider, task in task_assignments
-        ])
+        if not self.use_batch_api:
+            # Execute all tasks concurrently
+            responses = await asyncio.gather(*[
+                self._execute_primary_task(provider, task) 
+                for provider, task in task_assignments
+            ])
+            
+            return responses
+        
+        # Group same-provider tasks so each provider gets a single batch job
+        grouped: Dict[AIProvider, List[int]] = {}
+        for index, (provider, _) in enumerate(task_assignments):
+            grouped.setdefault(provider, []).append(index)
+        
+        responses = [None] * len(tasks)
+        
+        async def run_group(provider: AIProvider, indices: List[int]):
+            group_tasks = [tasks[i] for i in indices]
+            if len(group_tasks) > 1 and self._supports_batch_api(provider):
+                results = await self._execute_batch(provider, group_tasks)
+            else:
+                results = await asyncio.gather(*[
+                    self._execute_primary_task(provider, task) for task in group_tasks
+                ])
+            for index, result in zip(indices, results):
+                responses[index] = result
+        
+        await asyncio.gather(*[run_group(provider, indices) for provider, indices in grouped.items()])
         
         return responses
     
+    def _supports_batch_api(self, provider: AIProvider) -> bool:
+        """Whether the installed SDK for provider has a Batch API; older ones fall back to per-task calls"""
+        client = self.clients.get(provider)
+        if provider == AIProvider.OPENAI:
+            return hasattr(client, 'batches')
+        if provider == AIProvider.ANTHROPIC:
+            return hasattr(getattr(client, 'messages', None), 'batches')
+        return False
+    
+    async def _execute_batch(self, provider: AIProvider, tasks: List[AITask]) -> List[AIResponse]:
+        """Execute same-provider tasks through the provider's Batch API"""
+        responses: List[Optional[AIResponse]] = [None] * len(tasks)
+        pending = []
+        
+        for index, task in enumerate(tasks):
+            scope, cache_text = self._cache_key(provider, task)
+            cached = await self.response_cache.get(cache_text, scope, fuzzy=self._cache_fuzzy(task))
+            if cached is not None:
+                responses[index] = replace(cached, execution_time=0.0)
+            else:
+                pending.append(index)
+        
+        if pending:
+            start_time = time.time()
+            pending_tasks = [tasks[i] for i in pending]
+            if provider == AIProvider.OPENAI:
+                results = await self._execute_batch_openai(pending_tasks)
+            else:
+                results = await self._execute_batch_anthropic(pending_tasks)
+            execution_time = time.time() - start_time
+            
+            for batch_index, index in enumerate(pending):
+                result = results.get(str(batch_index))
+                if result is None:
+                    # Request failed inside the batch, retry it on its own
+                    responses[index] = await self._execute_primary_task(provider, tasks[index])
+                    continue
+                
+                responses[index] = self._build_response(provider, result, execution_time)
+                scope, cache_text = self._cache_key(provider, tasks[index])
+                await self.response_cache.set(cache_text, responses[index], scope,
+                                              fuzzy=self._cache_fuzzy(tasks[index]))
+        
+        return responses
+    
+    async def _execute_batch_openai(self, tasks: List[AITask]) -> Dict[str, Dict[str, Any]]:
+        """Run tasks through the OpenAI Batch API, returning parsed results by custom_id"""
+        client = self._client(AIProvider.OPENAI)
+        
+        lines = [
+            fast_json.dumps({
+                "custom_id": str(index),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": "gpt-4",
+                    "messages": self._openai_messages(task),
+                    "max_tokens": 4000,
+                    "temperature": 0.7
+                }
+            })
+            for index, task in enumerate(tasks)
+        ]
+        
+        batch_file = await client.files.create(
+            file=("tasks.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(self.batch_poll_interval)
+            batch = await client.batches.retrieve(batch.id)
+        
+        results = {}
+        if batch.status != "completed" or not batch.output_file_id:
+            print(f"OpenAI batch {batch.id} ended with status {batch.status}")
+            return results
+        
+        output = await client.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            item = fast_json.loads(line)
+            response = item.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            body = response["body"]
+            results[item["custom_id"]] = self._parse_ai_response(
+                body["choices"][0]["message"]["content"],
+                body["usage"]["total_tokens"]
+            )
+        
+        return results
+    
+    async def _execute_batch_anthropic(self, tasks: List[AITask]) -> Dict[str, Dict[str, Any]]:
+        """Run tasks through the Anthropic Message Batches API, returning parsed results by custom_id"""
+        client = self._client(AIProvider.ANTHROPIC)
+        
+        batch = await client.messages.batches.create(requests=[
+            {
+                "custom_id": str(index),
+                "params": {
+                    "model": "claude-3-sonnet-20240229",
+                    "max_tokens": 4000,
+                    "messages": [{"role": "user", "content": self._anthropic_prompt(task)}]
+                }
+            }
+            for index, task in enumerate(tasks)
+        ])
+        
+        while batch.processing_status != "ended":
+            await asyncio.sleep(self.batch_poll_interval)
+            batch = await client.messages.batches.retrieve(batch.id)
+        
+        results = {}
+        async for item in await client.messages.batches.results(batch.id):
+            if item.result.type != "succeeded":
+                continue
+            message = item.result.message
+            results[item.custom_id] = self._parse_ai_response(
+                message.content[0].text,
+                message.usage.input_tokens + message.usage.output_tokens
+            )
+        
+        return results
+    
     def _select_best_provider(self, task: AITask) -> AIProvider:
         """Select the best AI provider for a specific task"""
         task_type = task.task_type
-        
-        provider_scores = {}
-        for provider, spec in self.ai_specializations.items():
-            if provider not in self.clients:
-                continue
-                
-            score = 0
-            if any(strength in task_type for strength in spec['strengths']):
-                score += 3
-            if any(use_case in task_type for use_case in spec['use_for']):
-                score += 2
-                
-            provider_scores[provider] = score
+        provider_scores = dict(self._static_scores(task_type))
         
         if not provider_scores:
             return list(self.clients.keys())[0]  # Fallback to first available
+        
+        # Adjust the static specialization scores with measured performance
+        for provider, adjustment in self.scoreboard.live_scores(provider_scores, task_type).items():
+            provider_scores[provider] += adjustment
             
         return max(provider_scores.items(), key=lambda x: x[1])[0]
     
+    def _static_scores(self, task_type: str) -> Dict[AIProvider, int]:
+        """Specialization scores per connected provider, computed once per task type"""
+        scores = self._specialization_scores.get(task_type)
+        if scores is None:
+            scores = {}
+            for provider, spec in self.ai_specializations.items():
+                if provider not in self.clients:
+                    continue
+                
+                score = 0
+                if any(strength in task_type for strength in spec['strengths']):
+                    score += 3
+                if any(use_case in task_type for use_case in spec['use_for']):
+                    score += 2
+                
+                scores[provider] = score
+            self._specialization_scores[task_type] = scores
+        return scores
+    
     async def _execute_review_tasks(self, tasks: List[AITask]) -> List[AIResponse]:
         """Execute review tasks with specialized AIs"""
-        reviews = []
+        review_coros = []
         
         for task in tasks:
             if "security" in task.task_type and AIProvider.ANTHROPIC in self.clients:
@@ -196,11 +748,34 @@ class MultiAIManager:
             else:
                 provider = self._select_best_provider(task)
             
-            review = await self._execute_primary_task(provider, task)
-            reviews.append(review)
+            review_coros.append(self._execute_primary_task(provider, task))
+        
+        # Reviews are independent, so run them all at once
+        results = await asyncio.gather(*review_coros, return_exceptions=True)
+        
+        reviews = []
+        for task, result in zip(tasks, results):
+            if isinstance(result, Exception):
+                print(f"Review {task.task_type} failed: {result}")
+            else:
+                reviews.append(result)
         
         return reviews
     
+    async def _execute_consensus_tasks(self, tasks: List[AITask]) -> List[Dict[AIProvider, Any]]:
+        """Ask every connected AI each task at once; per task, each provider's response or exception"""
+        providers = list(self.clients)
+        assignments = [(provider, task) for task in tasks for provider in providers]
+        # Paraphrased questions are matched by similarity, so embed them all in one request up front
+        await self._prewarm_embeddings(assignments)
+        
+        results = await asyncio.gather(*[
+            self._execute_primary_task(provider, task) for provider, task in assignments
+        ], return_exceptions=True)
+        
+        return [dict(zip(providers, results[start:start + len(providers)]))
+                for start in range(0, len(results), len(providers))]
+    
     async def _reach_consensus(self, code: str, reviews: List[AIResponse]) -> str:
         """Have AIs reach consensus on final code"""
         consensus_task = AITask(
@@ -219,8 +794,8 @@ class MultiAIManager:
         
         return final_response.content
     
-    async def _query_openai(self, task: AITask) -> Dict[str, Any]:
-        """Query OpenAI with enhanced prompts"""
+    def _openai_messages(self, task: AITask) -> List[Dict[str, str]]:
+        """Build the OpenAI chat messages for a task"""
         system_prompt = f"""You are an expert software architect collaborating with other AI systems. 
         Task: {task.task_type}
         Focus on: {self.ai_specializations[AIProvider.OPENAI]['strengths']}
@@ -231,129 +806,131 @@ class MultiAIManager:
         - reasoning: Why you chose this approach
         """
         
-        response = await self.clients[AIProvider.OPENAI].chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"{task.description}\n\nContext: {json.dumps(task.context)}"}
-            ],
-            max_tokens=4000,
-            temperature=0.7
-        )
-        
-        try:
-            result = json.loads(response.choices[0].message.content)
-            result['tokens_used'] = response.usage.total_tokens
-            return result
-        except:
-            return {
-                "content": response.choices[0].message.content,
-                "confidence": 0.8,
-                "reasoning": "Standard response",
-                "tokens_used": response.usage.total_tokens
-            }
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"{task.description}\n\nContext: {task.context_json}"}
+        ]
     
-    async def _query_anthropic(self, task: AITask) -> Dict[str, Any]:
-        """Query Anthropic Claude"""
-        prompt = f"""Task: {task.task_type}
+    def _anthropic_prompt(self, task: AITask) -> str:
+        """Build the Anthropic prompt for a task"""
+        return f"""Task: {task.task_type}
         Description: {task.description}
-        Context: {json.dumps(task.context)}
+        Context: {task.context_json}
         
         As an AI specializing in {self.ai_specializations[AIProvider.ANTHROPIC]['strengths']}, 
         provide your analysis and recommendations.
         
         Respond in JSON format with content, confidence, and reasoning.
         """
-        
-        message = await self.clients[AIProvider.ANTHROPIC].messages.create(
-            model="claude-3-sonnet-20240229",
-            max_tokens=4000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
+    
+    def _parse_ai_response(self, text: str, tokens_used: int) -> Dict[str, Any]:
+        """Parse a JSON reply, falling back to the raw text"""
         try:
-            result = json.loads(message.content[0].text)
-            result['tokens_used'] = message.usage.input_tokens + message.usage.output_tokens
+            result = fast_json.loads(text)
+            result['tokens_used'] = tokens_used
             return result
         except:
             return {
-                "content": message.content[0].text,
+                "content": text,
                 "confidence": 0.8,
                 "reasoning": "Standard response",
-                "tokens_used": message.usage.input_tokens + message.usage.output_tokens
+                "tokens_used": tokens_used
             }
     
+    async def _query_openai(self, task: AITask, on_text: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """Query OpenAI with enhanced prompts, streaming the reply"""
+        stream = await self._client(AIProvider.OPENAI).chat.completions.create(
+            model="gpt-4",
+            messages=self._openai_messages(task),
+            max_tokens=4000,
+            temperature=0.7,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        
+        parts = []
+        tokens_used = 0
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                text = chunk.choices[0].delta.content
+                parts.append(text)
+                if on_text:
+                    on_text(text)
+            if chunk.usage:
+                # Only the final chunk carries usage
+                tokens_used = chunk.usage.total_tokens
+        
+        return self._parse_ai_response("".join(parts), tokens_used)
+    
+    async def _query_anthropic(self, task: AITask, on_text: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """Query Anthropic Claude, streaming the reply"""
+        async with self._client(AIProvider.ANTHROPIC).messages.stream(
+            model="claude-3-sonnet-20240229",
+            max_tokens=4000,
+            messages=[{"role": "user", "content": self._anthropic_prompt(task)}]
+        ) as stream:
+            async for text in stream.text_stream:
+                if on_text:
+                    on_text(text)
+            message = await stream.get_final_message()
+        
+        return self._parse_ai_response(
+            message.content[0].text,
+            message.usage.input_tokens + message.usage.output_tokens
+        )
+    
     async def _query_gemini(self, task: AITask) -> Dict[str, Any]:
         """Query Google Gemini"""
         prompt = f"""Task: {task.task_type}
         Description: {task.description}
-        Context: {json.dumps(task.context)}
+        Context: {task.context_json}
         
         Focus on: {self.ai_specializations[AIProvider.GEMINI]['strengths']}
         
         Provide response in JSON format with content, confidence, and reasoning.
         """
         
-        response = await self.clients[AIProvider.GEMINI].generate_content_async(prompt)
+        response = await self._client(AIProvider.GEMINI).generate_content_async(prompt)
         
-        try:
-            result = json.loads(response.text)
-            result['tokens_used'] = len(response.text.split())  # Approximation
-            return result
-        except:
-            return {
-                "content": response.text,
-                "confidence": 0.8,
-                "reasoning": "Standard response",
-                "tokens_used": len(response.text.split())
-            }
+        return self._parse_ai_response(response.text, len(response.text.split()))  # Token count approximation
     
     async def _query_mistral(self, task: AITask) -> Dict[str, Any]:
         """Query Mistral AI"""
         prompt = f"""Task: {task.task_type}
         Description: {task.description}
-        Context: {json.dumps(task.context)}
+        Context: {task.context_json}
         
         Specializing in: {self.ai_specializations[AIProvider.MISTRAL]['strengths']}
         
         Respond in JSON with content, confidence, and reasoning.
         """
         
-        response = await self.clients[AIProvider.MISTRAL].chat(
+        response = await self._client(AIProvider.MISTRAL).chat(
             model="mistral-large-latest",
             messages=[{"role": "user", "content": prompt}],
             max_tokens=4000
         )
         
-        try:
-            result = json.loads(response.choices[0].message.content)
-            result['tokens_used'] = response.usage.total_tokens
-            return result
-        except:
-            return {
-                "content": response.choices[0].message.content,
-                "confidence": 0.8,
-                "reasoning": "Standard response",
-                "tokens_used": response.usage.total_tokens
-            }
+        return self._parse_ai_response(response.choices[0].message.content, response.usage.total_tokens)
     
     def _combine_responses(self, responses: List[AIResponse]) -> str:
         """Combine multiple AI responses into cohesive code"""
-        combined = "// === MULTI-AI COLLABORATIVE CODE ===\n\n"
+        parts = ["// === MULTI-AI COLLABORATIVE CODE ===\n\n"]
         
         for i, response in enumerate(responses, 1):
-            combined += f"// === Section {i}: Generated by {response.provider.value} ===\n"
-            combined += f"// Confidence: {response.confidence}, Execution Time: {response.execution_time:.2f}s\n"
-            combined += response.content + "\n\n"
+            parts.append(f"// === Section {i}: Generated by {response.provider.value} ===\n")
+            parts.append(f"// Confidence: {response.confidence}, Execution Time: {response.execution_time:.2f}s\n")
+            parts.append(response.content)
+            parts.append("\n\n")
         
-        return combined
+        return "".join(parts)
     
     def _summarize_reviews(self, reviews: List[AIResponse]) -> str:
         """Summarize all review feedback"""
-        summary = "Review Summary:\n"
+        parts = ["Review Summary:\n"]
         for review in reviews:
-            summary += f"- {review.provider.value}: {review.content[:200]}...\n"
-        return summary
+            parts.append(f"- {review.provider.value}: {review.content[:200]}...\n")
+        return "".join(parts)
     
     def _generate_collaboration_summary(self, responses: List[AIResponse], reviews: List[AIResponse]) -> Dict[str, Any]:
         """Generate a summary of the collaboration process"""
@@ -369,6 +946,19 @@ class MultiAIManager:
             ]
         }
 
+# A "// FILE: name" or "# FILE: name" line starting a file in combined code
+_FILE_MARKER = re.compile(r'^(?://|#) FILE:([^\n]*)$\n?', re.MULTILINE)
+
+_NON_ALNUM = re.compile(r'[^a-zA-Z0-9\s]')
+_SPACES = re.compile(r'\s+')
+
+@functools.lru_cache(maxsize=256)
+def _repo_slug(description: str) -> str:
+    """Simple repo name generation"""
+    name = _NON_ALNUM.sub('', description.lower())
+    name = _SPACES.sub('-', name.strip())
+    return name[:50] if len(name) > 50 else name
+
 class CollaborativeCodeGenerator:
     def __init__(self, multi_ai_manager: MultiAIManager):
         self.ai_manager = multi_ai_manager
@@ -403,21 +993,18 @@ class CollaborativeCodeGenerator:
         files = {}
         code_content = result.get("code", "")
         
-        # Simple file extraction logic (can be enhanced)
-        current_file = None
-        current_content = []
-        
-        for line in code_content.split('\n'):
-            if line.startswith('// FILE:') or line.startswith('# FILE:'):
-                if current_file:
-                    files[current_file] = '\n'.join(current_content)
-                current_file = line.split(':', 1)[1].strip()
-                current_content = []
-            elif current_file:
-                current_content.append(line)
+        # Split on the FILE markers in one pass: [preamble, name1, body1, name2, body2, ...]
+        parts = _FILE_MARKER.split(code_content)
+        last = len(parts) - 1
         
-        if current_file:
-            files[current_file] = '\n'.join(current_content)
+        for index in range(1, len(parts), 2):
+            name = parts[index].strip()
+            body = parts[index + 1]
+            if index + 1 < last and body.endswith('\n'):
+                # The newline belongs to the next marker's line
+                body = body[:-1]
+            if name:
+                files[name] = body
         
         return files if files else {"main.py": code_content}
     
@@ -452,11 +1039,7 @@ class CollaborativeCodeGenerator:
     
     def _generate_repo_name(self, description: str) -> str:
         """Generate a suitable repository name"""
-        import re
-        # Simple repo name generation
-        name = re.sub(r'[^a-zA-Z0-9\s]', '', description.lower())
-        name = re.sub(r'\s+', '-', name.strip())
-        return name[:50] if len(name) > 50 else name
+        return _repo_slug(description)
     
     def _generate_ai_insights(self, result: Dict[str, Any]) -> Dict[str, Any]:
         """Generate insights about the AI collaboration"""
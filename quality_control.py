@@ -1,26 +1,56 @@
 
 import ast
+import importlib.util
 import os
+import re
 import sys
 import subprocess
 import json
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
 import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+# Below this many files, worker process start-up costs more than it saves
+PARALLEL_MIN_FILES = 8
+
+_TODO_RE = re.compile(r'\b(TODO|FIXME)\b')
 
 class QualityControl:
     """Comprehensive quality control system to prevent rushing and ensure code quality"""
     
+    # directory -> (mtime, python files); a directory's mtime changes whenever entries are added or removed
+    _listing_cache: Dict[str, Tuple[int, List[str]]] = {}
+    
     def __init__(self):
         self.errors = []
         self.warnings = []
         self.suggestions = []
+        # file_path -> (mtime, source, tree), so each file is read and parsed once per run
+        self._parsed: Dict[str, Tuple[Optional[float], str, ast.AST]] = {}
     
-    def validate_syntax(self, file_path: str) -> bool:
-        """Check Python syntax before deployment"""
-        try:
+    def _parse(self, file_path: str, source: Optional[str] = None) -> Tuple[str, ast.AST]:
+        """Parse a file (or its already loaded source), reusing the previous tree while it is unchanged"""
+        cached = self._parsed.get(file_path)
+        if source is not None:
+            if cached and cached[1] == source:
+                return cached[1], cached[2]
+            mtime = None
+        else:
+            mtime = os.path.getmtime(file_path)
+            if cached and cached[0] == mtime:
+                return cached[1], cached[2]
             with open(file_path, 'r') as f:
                 source = f.read()
-            ast.parse(source)
+        
+        tree = ast.parse(source)
+        self._parsed[file_path] = (mtime, source, tree)
+        return source, tree
+    
+    def validate_syntax(self, file_path: str, source: Optional[str] = None) -> bool:
+        """Check Python syntax before deployment"""
+        try:
+            self._parse(file_path, source)
             return True
         except SyntaxError as e:
             self.errors.append(f"Syntax error in {file_path}: {e}")
@@ -29,26 +59,20 @@ class QualityControl:
             self.errors.append(f"Error parsing {file_path}: {e}")
             return False
     
-    def check_imports(self, file_path: str) -> bool:
+    def check_imports(self, file_path: str, source: Optional[str] = None) -> bool:
         """Verify all imports are available"""
         try:
-            with open(file_path, 'r') as f:
-                source = f.read()
-            
-            tree = ast.parse(source)
+            source, tree = self._parse(file_path, source)
             for node in ast.walk(tree):
                 if isinstance(node, ast.Import):
                     for alias in node.names:
-                        try:
-                            __import__(alias.name)
-                        except ImportError:
+                        if not self._module_available(alias.name):
                             self.errors.append(f"Missing import: {alias.name} in {file_path}")
                             return False
                 elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        try:
-                            __import__(node.module)
-                        except ImportError:
+                    # Relative imports resolve inside the project itself
+                    if node.module and not node.level:
+                        if not self._module_available(node.module):
                             self.errors.append(f"Missing module: {node.module} in {file_path}")
                             return False
             return True
@@ -56,28 +80,81 @@ class QualityControl:
             self.errors.append(f"Import check failed for {file_path}: {e}")
             return False
     
-    def validate_functions(self, file_path: str) -> bool:
+    def _module_available(self, name: str) -> bool:
+        """Locate a top-level module without importing (and so executing) it"""
+        try:
+            return importlib.util.find_spec(name.split('.')[0]) is not None
+        except (ImportError, ValueError):
+            return False
+    
+    def validate_functions(self, file_path: str, source: Optional[str] = None) -> bool:
         """Check function definitions and basic structure"""
         try:
-            with open(file_path, 'r') as f:
-                source = f.read()
-            
-            tree = ast.parse(source)
+            source, tree = self._parse(file_path, source)
             for node in ast.walk(tree):
                 if isinstance(node, ast.FunctionDef):
                     # Check for placeholder implementations
                     if any(isinstance(child, ast.Pass) for child in node.body):
                         self.warnings.append(f"Function {node.name} in {file_path} has placeholder implementation")
-                    
-                    # Check for TODO comments
-                    if "TODO" in source or "FIXME" in source:
-                        self.warnings.append(f"TODO/FIXME found in {file_path}")
+            
+            # Check for TODO comments, once per occurrence
+            for match in _TODO_RE.finditer(source):
+                line = source.count('\n', 0, match.start()) + 1
+                self.warnings.append(f"{match.group(1)} found in {file_path} at line {line}")
             
             return True
         except Exception as e:
             self.errors.append(f"Function validation failed for {file_path}: {e}")
             return False
     
+    def _python_files(self, directory: str) -> List[str]:
+        """List the .py files in a directory, rescanning only when its entries change"""
+        key = os.path.abspath(directory)
+        mtime = os.stat(directory).st_mtime_ns
+        cached = self._listing_cache.get(key)
+        if cached and cached[0] == mtime:
+            return list(cached[1])
+        
+        with os.scandir(directory) as entries:
+            files = [entry.name for entry in entries if entry.name.endswith('.py') and entry.is_file()]
+        QualityControl._listing_cache[key] = (mtime, files)
+        return list(files)
+    
+    def _load_sources(self, files: List[str]) -> Dict[str, str]:
+        """Read every file once, overlapping the reads in threads; unreadable files are left out"""
+        def read(file_path):
+            try:
+                return Path(file_path).read_text()
+            except (OSError, UnicodeDecodeError):
+                # The checks reopen it and report the error themselves
+                return None
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            sources = dict(zip(files, executor.map(read, files)))
+        return {path: source for path, source in sources.items() if source is not None}
+    
+    def check_file(self, file_path: str, source: Optional[str] = None) -> List[Tuple[bool, List[str], List[str]]]:
+        """Run syntax, import and function checks on one file, returning (passed, errors, warnings) for each"""
+        results = []
+        for check in (self.validate_syntax, self.check_imports, self.validate_functions):
+            errors_before, warnings_before = len(self.errors), len(self.warnings)
+            passed = check(file_path, source)
+            results.append((passed, self.errors[errors_before:], self.warnings[warnings_before:]))
+            del self.errors[errors_before:], self.warnings[warnings_before:]
+        return results
+    
+    def _check_files(self, python_files: List[str]) -> List[List[Tuple[bool, List[str], List[str]]]]:
+        """Check files across worker processes when there are enough of them"""
+        if len(python_files) >= PARALLEL_MIN_FILES:
+            try:
+                with ProcessPoolExecutor() as executor:
+                    return list(executor.map(_check_one_file, python_files, chunksize=4))
+            except Exception as e:
+                print(f"⚠️ Parallel quality check unavailable, checking serially: {e}")
+        
+        sources = self._load_sources(python_files)
+        return [self.check_file(file, sources.get(file)) for file in python_files]
+    
     def test_basic_functionality(self) -> bool:
         """Test basic app functionality before deployment"""
         try:
@@ -111,8 +188,9 @@ class QualityControl:
         self.errors = []
         self.warnings = []
         self.suggestions = []
+        self._parsed = {}
         
-        python_files = [f for f in os.listdir('.') if f.endswith('.py')]
+        python_files = self._python_files('.')
         
         all_passed = True
         
@@ -120,20 +198,15 @@ class QualityControl:
         if not self.validate_env_requirements():
             all_passed = False
         
-        # 2. Syntax validation
-        for file in python_files:
-            if not self.validate_syntax(file):
-                all_passed = False
-        
-        # 3. Import validation
-        for file in python_files:
-            if not self.check_imports(file):
-                all_passed = False
-        
-        # 4. Function validation
-        for file in python_files:
-            if not self.validate_functions(file):
-                all_passed = False
+        # 2-4. Syntax, import and function validation, reported check by check
+        file_results = self._check_files(python_files)
+        for check_index in range(3):
+            for results in file_results:
+                passed, errors, warnings = results[check_index]
+                self.errors.extend(errors)
+                self.warnings.extend(warnings)
+                if not passed:
+                    all_passed = False
         
         # 5. Basic functionality test
         if not self.test_basic_functionality():
@@ -181,6 +254,10 @@ class QualityControl:
         
         return report
 
+def _check_one_file(file_path: str) -> List[Tuple[bool, List[str], List[str]]]:
+    """Worker entry point for parallel quality checks"""
+    return QualityControl().check_file(file_path)
+
 # Quality control integration for main app
 def pre_deployment_check():
     """Run before any deployment"""
@@ -1,20 +1,56 @@
 
 import asyncio
-import json
+import bisect
 import time
-from typing import Dict, List, Set
+from collections import deque
+from itertools import islice
+from typing import Any, Dict, List, Optional, Set, Union
 import websockets
-from dataclasses import dataclass, asdict
+import fast_json
+from dataclasses import dataclass, field, replace
 
-@dataclass
+# uvloop's libuv event loop is considerably faster for socket-heavy servers
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# Frames queued for one connection before it is dropped as too slow
+OUTBOX_SIZE = 256
+# Messages waiting for a workspace's worker before readers are made to wait
+SHARD_QUEUE_SIZE = 1000
+# Applied operations kept for transforming late edits; clients further behind are resynced
+OPERATION_WINDOW = 10000
+
+# Largest inbound frame accepted; pasted files can exceed websockets' 1 MiB default
+MAX_MESSAGE_SIZE = 4 * 1024 * 1024
+# Heartbeat cadence, so dead connections are noticed and cleaned up within ~40s
+PING_INTERVAL = 20
+PING_TIMEOUT = 20
+
+# Fixed head of the most frequent broadcast; only the varying fields are encoded per move
+_CURSOR_UPDATE_PREFIX = '{"type":"cursor_update","user_id":'
+
+@dataclass(slots=True)
 class User:
     id: str
     name: str
     avatar: str
     cursor_position: Dict = None
     active_file: str = None
+    
+    def to_dict(self) -> Dict:
+        # Hand-written: asdict() deep-copies every field on each broadcast
+        return {
+            'id': self.id,
+            'name': self.name,
+            'avatar': self.avatar,
+            'cursor_position': self.cursor_position,
+            'active_file': self.active_file
+        }
 
-@dataclass
+@dataclass(slots=True)
 class Operation:
     type: str  # 'insert', 'delete', 'cursor_move'
     file_path: str
@@ -22,63 +58,335 @@ class Operation:
     content: str = ""
     user_id: str = ""
     timestamp: float = 0
+    revision: int = 0  # workspace revision this operation produced
+    
+    def to_dict(self) -> Dict:
+        return {
+            'type': self.type,
+            'file_path': self.file_path,
+            'position': self.position,
+            'content': self.content,
+            'user_id': self.user_id,
+            'timestamp': self.timestamp,
+            'revision': self.revision
+        }
+
+def transform_operation(op: Operation, prior: Operation) -> List[Operation]:
+    """Rewrite op, made without seeing prior, so it applies after prior.
+
+    Returns the resulting operations (a delete around a concurrent insert splits
+    in two; a delete already covered by prior disappears). Split pieces are given
+    right to left, so each can be applied without shifting the others.
+    """
+    if op.file_path != prior.file_path or prior.type not in ('insert', 'delete'):
+        return [op]
+    
+    p, n = prior.position, len(prior.content)
+    
+    if op.type == 'insert':
+        if prior.type == 'insert':
+            # On a tie the operation the server applied first stays in front
+            return [replace(op, position=op.position + n)] if p <= op.position else [op]
+        if op.position >= p + n:
+            return [replace(op, position=op.position - n)]
+        return [replace(op, position=p)] if op.position > p else [op]
+    
+    if op.type != 'delete':
+        return [op]
+    
+    q, m = op.position, len(op.content)
+    if prior.type == 'insert':
+        if p <= q:
+            return [replace(op, position=q + n)]
+        if p >= q + m:
+            return [op]
+        # Keep the concurrent insert: delete the text on either side of it
+        split = p - q
+        return [replace(op, position=p + n, content=op.content[split:]),
+                replace(op, position=q, content=op.content[:split])]
+    
+    if q + m <= p:
+        return [op]
+    if q >= p + n:
+        return [replace(op, position=q - n)]
+    # Overlapping deletes: only delete what prior left behind
+    remaining = op.content[:max(p - q, 0)] + op.content[max(p + n - q, 0):]
+    return [replace(op, position=min(p, q), content=remaining)] if remaining else []
+
+class Rope:
+    """Text kept as a list of ~4 KB chunks, so an edit copies one chunk instead of the whole file"""
+    
+    LEAF_SIZE = 4096
+    
+    def __init__(self, text: str = ""):
+        self._chunks: List[str] = self._split(text)
+        self._starts: List[int] = []  # offset of each chunk's first character
+        self._length = 0
+        self._reindex(0)
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __str__(self) -> str:
+        return "".join(self._chunks)
+    
+    def _split(self, text: str) -> List[str]:
+        return [text[i:i + self.LEAF_SIZE] for i in range(0, len(text), self.LEAF_SIZE)]
+    
+    def _reindex(self, index: int):
+        """Recompute chunk offsets from index onwards"""
+        del self._starts[index:]
+        offset = self._starts[-1] + len(self._chunks[index - 1]) if index else 0
+        for chunk in self._chunks[index:]:
+            self._starts.append(offset)
+            offset += len(chunk)
+        self._length = offset
+    
+    def _locate(self, position: int) -> int:
+        """Index of the chunk holding position (the last chunk for the end of the text)"""
+        return max(bisect.bisect_right(self._starts, position) - 1, 0)
+    
+    def _replace(self, first: int, last: int, text: str):
+        """Replace chunks first..last with text, re-splitting it if it grew too large"""
+        pieces = self._split(text) if len(text) > 2 * self.LEAF_SIZE else ([text] if text else [])
+        self._chunks[first:last + 1] = pieces
+        self._reindex(first)
+    
+    def insert(self, position: int, text: str):
+        if not text:
+            return
+        position = min(max(position, 0), self._length)
+        if not self._chunks:
+            self._replace(0, -1, text)
+            return
+        
+        index = self._locate(position)
+        chunk = self._chunks[index]
+        offset = position - self._starts[index]
+        self._replace(index, index, chunk[:offset] + text + chunk[offset:])
+    
+    def delete(self, position: int, length: int):
+        position = min(max(position, 0), self._length)
+        end = min(position + max(length, 0), self._length)
+        if end <= position:
+            return
+        
+        first, last = self._locate(position), self._locate(end)
+        head = self._chunks[first][:position - self._starts[first]]
+        tail = self._chunks[last][end - self._starts[last]:]
+        self._replace(first, last, head + tail)
+    
+    def substr(self, start: int, end: int) -> str:
+        start = min(max(start, 0), self._length)
+        end = min(max(end, start), self._length)
+        if start == end:
+            return ""
+        first, last = self._locate(start), self._locate(end - 1)
+        text = "".join(self._chunks[first:last + 1])
+        return text[start - self._starts[first]:end - self._starts[first]]
+
+class Outbox:
+    """Bounded queue of outgoing frames for one connection, drained by its own writer task"""
+    
+    def __init__(self, websocket, maxsize: int = OUTBOX_SIZE):
+        self.websocket = websocket
+        self.maxsize = maxsize
+        self.closed = False
+        self._frames = deque()  # [payload] entries; coalesced-away and sent entries are blanked to None
+        self._size = 0
+        self._latest: Dict[Any, List] = {}  # coalesce key -> its queued entry
+        self._ready = asyncio.Event()
+        self._writer = asyncio.create_task(self._run())
+    
+    def push(self, payload: str, coalesce_key: Any = None) -> bool:
+        """Queue a frame; False means the connection has fallen too far behind"""
+        if self.closed:
+            return False
+        
+        if coalesce_key is not None:
+            # Only the newest cursor/selection per sender is worth sending; a blank entry was already sent
+            stale = self._latest.pop(coalesce_key, None)
+            if stale is not None and stale[0] is not None:
+                stale[0] = None
+                self._size -= 1
+        
+        if self._size >= self.maxsize:
+            return False
+        
+        entry = [payload]
+        self._frames.append(entry)
+        self._size += 1
+        if coalesce_key is not None:
+            self._latest[coalesce_key] = entry
+        self._ready.set()
+        return True
+    
+    async def _run(self):
+        try:
+            while True:
+                while not self._frames:
+                    self._ready.clear()
+                    await self._ready.wait()
+                entry = self._frames.popleft()
+                payload = entry[0]
+                if payload is None:
+                    continue
+                # Blank it as sent, so a later frame with its coalesce key doesn't count it off the queue again
+                entry[0] = None
+                self._size -= 1
+                await self.websocket.send(payload)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        except Exception as e:
+            print(f"Writer for connection failed: {e}")
+        finally:
+            self.closed = True
+    
+    def close(self, code: Optional[int] = None, reason: str = ""):
+        """Stop writing; with a code, also close the socket so the client reconnects"""
+        self.closed = True
+        self._writer.cancel()
+        if code is not None:
+            self._closer = asyncio.create_task(self.websocket.close(code, reason))
+
+@dataclass
+class WorkspaceShard:
+    """Everything one workspace owns, plus the worker that applies its messages in order"""
+    workspace_id: str
+    users: Dict[str, User] = field(default_factory=dict)
+    files: Dict[str, Rope] = field(default_factory=dict)
+    operations: deque = field(default_factory=lambda: deque(maxlen=OPERATION_WINDOW))
+    revision: int = 0  # operations applied so far
+    connections: Dict[str, Outbox] = field(default_factory=dict)  # user_id -> outbox of its websocket
+    file_subscribers: Dict[str, Set[str]] = field(default_factory=dict)  # file_path -> users with it open
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=SHARD_QUEUE_SIZE))
+    worker: Optional[asyncio.Task] = None
+    # Rebuilt lazily after membership (or, for the users JSON, user state) changes
+    _recipients: Optional[tuple] = field(default=None, repr=False)
+    _users_json: Optional[str] = field(default=None, repr=False)
+    
+    def members_changed(self):
+        self._recipients = None
+        self._users_json = None
+    
+    def users_changed(self):
+        self._users_json = None
+    
+    def recipients(self) -> tuple:
+        """Connected users of this workspace, as a snapshot that is safe to iterate while it changes"""
+        if self._recipients is None:
+            self._recipients = tuple(user_id for user_id in self.connections if user_id in self.users)
+        return self._recipients
+    
+    def users_json(self) -> str:
+        if self._users_json is None:
+            self._users_json = fast_json.dumps({uid: user.to_dict() for uid, user in self.users.items()})
+        return self._users_json
+    
+    def set_active_file(self, user_id: str, file_path: Optional[str]) -> bool:
+        """Point the user at a file, moving their subscription from the one they had open.
+
+        Returns True if the subscription moved.
+        """
+        user = self.users[user_id]
+        changed = user.active_file != file_path
+        if changed:
+            self.unsubscribe(user_id)
+            if file_path is not None:
+                self.file_subscribers.setdefault(file_path, set()).add(user_id)
+        user.active_file = file_path
+        self.users_changed()
+        return changed
+    
+    def unsubscribe(self, user_id: str):
+        user = self.users.get(user_id)
+        subscribers = self.file_subscribers.get(user.active_file) if user else None
+        if subscribers is not None:
+            subscribers.discard(user_id)
+            if not subscribers:
+                del self.file_subscribers[user.active_file]
 
 class CollaborationManager:
     def __init__(self):
-        self.workspaces: Dict[str, Dict] = {}  # workspace_id -> workspace_data
-        self.connections: Dict[str, websockets.WebSocketServerProtocol] = {}
+        self.shards: Dict[str, WorkspaceShard] = {}  # workspace_id -> shard
         self.user_workspaces: Dict[str, str] = {}  # user_id -> workspace_id
     
     async def handle_connection(self, websocket, path):
         """Handle new WebSocket connection"""
+        user_id = None
         try:
             # Wait for authentication message
             auth_message = await websocket.recv()
-            auth_data = json.loads(auth_message)
+            auth_data = fast_json.loads(auth_message)
             
             user_id = auth_data['user_id']
             workspace_id = auth_data['workspace_id']
             
+            # Initialize workspace if needed
+            shard = self.get_shard(workspace_id)
+            
             # Register connection
-            self.connections[user_id] = websocket
+            shard.connections[user_id] = Outbox(websocket)
             self.user_workspaces[user_id] = workspace_id
             
-            # Initialize workspace if needed
-            if workspace_id not in self.workspaces:
-                self.workspaces[workspace_id] = {
-                    'users': {},
-                    'files': {},
-                    'operations': []
-                }
-            
             # Add user to workspace
-            self.workspaces[workspace_id]['users'][user_id] = User(
+            shard.users[user_id] = User(
                 id=user_id,
                 name=auth_data.get('name', f'User {user_id[:8]}'),
                 avatar=auth_data.get('avatar', '👤')
             )
+            shard.members_changed()
             
             # Notify other users
             await self.broadcast_to_workspace(workspace_id, {
                 'type': 'user_joined',
-                'user': asdict(self.workspaces[workspace_id]['users'][user_id])
+                'user': shard.users[user_id].to_dict()
             }, exclude_user=user_id)
             
             # Send current state to new user
-            await websocket.send(json.dumps({
-                'type': 'workspace_state',
-                'files': self.workspaces[workspace_id]['files'],
-                'users': {uid: asdict(user) for uid, user in self.workspaces[workspace_id]['users'].items()}
-            }))
+            self.send_to_user(shard, user_id, self.workspace_state(shard))
             
             # Handle messages
             async for message in websocket:
-                await self.handle_message(user_id, json.loads(message))
+                await self.handle_message(user_id, fast_json.loads(message))
                 
         except websockets.exceptions.ConnectionClosed:
             pass
         finally:
-            await self.handle_disconnect(user_id)
+            if user_id:
+                await self.handle_disconnect(user_id)
+    
+    def workspace_state(self, shard: WorkspaceShard) -> str:
+        """Serialized snapshot of a workspace's files, revision and users"""
+        files = fast_json.dumps({path: str(rope) for path, rope in shard.files.items()})
+        return (f'{{"type":"workspace_state","files":{files},'
+                f'"revision":{shard.revision},"users":{shard.users_json()}}}')
+    
+    def get_shard(self, workspace_id: str) -> WorkspaceShard:
+        """Return the workspace's shard, creating it and starting its worker on first use"""
+        shard = self.shards.get(workspace_id)
+        if shard is None:
+            shard = self.shards[workspace_id] = WorkspaceShard(workspace_id)
+            shard.worker = asyncio.create_task(self._run_shard(shard))
+        return shard
+    
+    def drop_shard(self, shard: WorkspaceShard):
+        """Forget a workspace and stop its worker; messages still queued for it are discarded"""
+        if self.shards.get(shard.workspace_id) is shard:
+            del self.shards[shard.workspace_id]
+        if shard.worker is not None:
+            shard.worker.cancel()
+    
+    async def _run_shard(self, shard: WorkspaceShard):
+        """Apply one workspace's messages in arrival order, independently of other workspaces"""
+        while True:
+            user_id, message = await shard.queue.get()
+            try:
+                await self.dispatch_message(user_id, shard.workspace_id, message)
+            except Exception as e:
+                print(f"Error handling {message.get('type')} in workspace {shard.workspace_id}: {e}")
+            finally:
+                shard.queue.task_done()
     
     async def handle_message(self, user_id: str, message: Dict):
         """Handle incoming message from user"""
@@ -86,6 +394,11 @@ class CollaborationManager:
         if not workspace_id:
             return
         
+        # A full queue makes this reader wait, pushing back on the client
+        await self.shards[workspace_id].queue.put((user_id, message))
+    
+    async def dispatch_message(self, user_id: str, workspace_id: str, message: Dict):
+        """Route a message to its handler"""
         message_type = message['type']
         
         if message_type == 'file_operation':
@@ -106,89 +419,167 @@ class CollaborationManager:
             timestamp=time.time()
         )
         
-        # Apply operation to workspace
-        workspace = self.workspaces[workspace_id]
+        shard = self.shards[workspace_id]
         
-        if operation.file_path not in workspace['files']:
-            workspace['files'][operation.file_path] = ""
+        # Transform against everything applied since the revision the client edited;
+        # clients without a revision are taken to be up to date
+        base = min(max(message.get('revision', shard.revision), 0), shard.revision)
+        behind = shard.revision - base
+        if behind > len(shard.operations):
+            # What the edit was made against has left the window; it can't be transformed, so start the client over
+            self.send_to_user(shard, user_id, self.workspace_state(shard))
+            return
+        
+        pending = [operation]
+        for prior in reversed(list(islice(reversed(shard.operations), behind))):
+            if prior.user_id != user_id:
+                pending = [t for op in pending for t in transform_operation(op, prior)]
         
-        file_content = workspace['files'][operation.file_path]
+        # Apply operation to workspace
+        if operation.file_path not in shard.files:
+            shard.files[operation.file_path] = Rope()
         
-        if operation.type == 'insert':
-            new_content = (file_content[:operation.position] + 
-                          operation.content + 
-                          file_content[operation.position:])
-            workspace['files'][operation.file_path] = new_content
-        elif operation.type == 'delete':
-            end_pos = operation.position + len(operation.content)
-            new_content = file_content[:operation.position] + file_content[end_pos:]
-            workspace['files'][operation.file_path] = new_content
+        file_content = shard.files[operation.file_path]
         
-        # Store operation
-        workspace['operations'].append(operation)
+        for op in pending:
+            if op.type == 'insert':
+                file_content.insert(op.position, op.content)
+            elif op.type == 'delete':
+                file_content.delete(op.position, len(op.content))
+            
+            # Store operation
+            shard.revision += 1
+            op.revision = shard.revision
+            shard.operations.append(op)
+            
+            # Broadcast to the other users with this file open
+            await self.broadcast_to_file(workspace_id, op.file_path, {
+                'type': 'file_operation',
+                'operation': op.to_dict()
+            }, exclude_user=user_id)
         
-        # Broadcast to other users
-        await self.broadcast_to_workspace(workspace_id, {
-            'type': 'file_operation',
-            'operation': asdict(operation)
-        }, exclude_user=user_id)
+        # Tell the sender which revision its edit became
+        if user_id in shard.connections:
+            self.send_to_user(shard, user_id, fast_json.dumps({
+                'type': 'operation_ack',
+                'file_path': operation.file_path,
+                'revision': shard.revision
+            }))
     
     async def handle_cursor_move(self, user_id: str, workspace_id: str, message: Dict):
         """Handle cursor movement"""
-        workspace = self.workspaces[workspace_id]
-        if user_id in workspace['users']:
-            workspace['users'][user_id].cursor_position = message['position']
-            workspace['users'][user_id].active_file = message['file_path']
+        shard = self.shards[workspace_id]
+        if user_id in shard.users:
+            shard.users[user_id].cursor_position = message['position']
+            if shard.set_active_file(user_id, message['file_path']):
+                self.send_file_state(shard, user_id, message['file_path'])
             
-            await self.broadcast_to_workspace(workspace_id, {
-                'type': 'cursor_update',
-                'user_id': user_id,
-                'position': message['position'],
-                'file_path': message['file_path']
-            }, exclude_user=user_id)
+            payload = (f'{_CURSOR_UPDATE_PREFIX}{fast_json.dumps(user_id)}'
+                       f',"position":{fast_json.dumps(message["position"])}'
+                       f',"file_path":{fast_json.dumps(message["file_path"])}}}')
+            await self.broadcast_to_file(workspace_id, message['file_path'], payload, exclude_user=user_id,
+                                         coalesce_key=('cursor', user_id))
     
     async def handle_file_select(self, user_id: str, workspace_id: str, message: Dict):
         """Handle file selection"""
-        workspace = self.workspaces[workspace_id]
-        if user_id in workspace['users']:
-            workspace['users'][user_id].active_file = message['file_path']
+        shard = self.shards[workspace_id]
+        if user_id in shard.users:
+            file_path = message['file_path']
+            shard.set_active_file(user_id, file_path)
+            self.send_file_state(shard, user_id, file_path)
             
+            # Presence stays workspace wide
             await self.broadcast_to_workspace(workspace_id, {
                 'type': 'file_select',
                 'user_id': user_id,
                 'file_path': message['file_path']
-            }, exclude_user=user_id)
+            }, exclude_user=user_id, coalesce_key=('select', user_id))
+    
+    def send_file_state(self, shard: WorkspaceShard, user_id: str, file_path: str):
+        """Catch a newly subscribed user up on a file, since its edits only went to its subscribers"""
+        rope = shard.files.get(file_path)
+        self.send_to_user(shard, user_id, fast_json.dumps({
+            'type': 'file_state',
+            'file_path': file_path,
+            'content': str(rope) if rope is not None else '',
+            'revision': shard.revision
+        }))
     
-    async def broadcast_to_workspace(self, workspace_id: str, message: Dict, exclude_user: str = None):
-        """Broadcast message to all users in workspace"""
-        workspace = self.workspaces.get(workspace_id, {})
-        users = workspace.get('users', {})
+    async def broadcast_to_workspace(self, workspace_id: str, message: Union[Dict, str], exclude_user: str = None,
+                                     coalesce_key: Any = None):
+        """Broadcast message (a dict, or an already serialized JSON string) to all users in workspace.
+
+        Messages sharing a coalesce_key replace each other while still queued.
+        """
+        shard = self.shards.get(workspace_id)
+        if shard is None:
+            return
+        
+        # Only this workspace's subscribers are ever walked
+        targets = shard.recipients()
+        if not targets:
+            return
         
-        for user_id in users:
-            if user_id != exclude_user and user_id in self.connections:
-                try:
-                    await self.connections[user_id].send(json.dumps(message))
-                except websockets.exceptions.ConnectionClosed:
-                    pass
+        # Serialize once; each connection's writer sends at its own pace
+        payload = message if isinstance(message, str) else fast_json.dumps(message)
+        for user_id in targets:
+            if user_id != exclude_user:
+                self.send_to_user(shard, user_id, payload, coalesce_key)
+    
+    async def broadcast_to_file(self, workspace_id: str, file_path: str, message: Union[Dict, str],
+                                exclude_user: str = None, coalesce_key: Any = None):
+        """Broadcast message only to the users of a workspace who have file_path open"""
+        shard = self.shards.get(workspace_id)
+        subscribers = shard.file_subscribers.get(file_path) if shard else None
+        if not subscribers:
+            return
+        
+        payload = message if isinstance(message, str) else fast_json.dumps(message)
+        for user_id in subscribers:
+            if user_id != exclude_user:
+                self.send_to_user(shard, user_id, payload, coalesce_key)
+    
+    def send_to_user(self, shard: WorkspaceShard, user_id: str, payload: str, coalesce_key: Any = None):
+        """Queue a serialized message for one user, dropping the connection if it can't keep up"""
+        outbox = shard.connections.get(user_id)
+        if outbox is None or outbox.push(payload, coalesce_key):
+            return
+        
+        # Skipping an edit would desync the client, so make it reconnect and resync instead
+        del shard.connections[user_id]
+        shard.members_changed()
+        if outbox.closed:
+            outbox.close()
+        else:
+            print(f"⚠️ Dropping slow client {user_id} in workspace {shard.workspace_id}")
+            outbox.close(1013, "Client too slow")
     
     async def handle_disconnect(self, user_id: str):
         """Handle user disconnect"""
         workspace_id = self.user_workspaces.get(user_id)
+        shard = self.shards.get(workspace_id)
         
-        if workspace_id and workspace_id in self.workspaces:
+        if shard:
             # Remove user from workspace
-            if user_id in self.workspaces[workspace_id]['users']:
-                del self.workspaces[workspace_id]['users'][user_id]
+            shard.unsubscribe(user_id)
+            if user_id in shard.users:
+                del shard.users[user_id]
+            outbox = shard.connections.pop(user_id, None)
+            shard.members_changed()
+            if outbox:
+                outbox.close()
             
-            # Notify other users
-            await self.broadcast_to_workspace(workspace_id, {
-                'type': 'user_left',
-                'user_id': user_id
-            })
+            if not shard.users:
+                # Nobody is left to edit or sync, so drop the workspace rather than keep its worker forever
+                self.drop_shard(shard)
+            else:
+                # Notify other users
+                await self.broadcast_to_workspace(workspace_id, {
+                    'type': 'user_left',
+                    'user_id': user_id
+                })
         
         # Clean up
-        if user_id in self.connections:
-            del self.connections[user_id]
         if user_id in self.user_workspaces:
             del self.user_workspaces[user_id]
 
@@ -197,8 +588,25 @@ collaboration_manager = CollaborationManager()
 
 async def start_collaboration_server():
     """Start the collaboration WebSocket server"""
+    # asyncio (and uvloop) already set TCP_NODELAY on every TCP stream, so small cursor frames aren't held back
     return await websockets.serve(
         collaboration_manager.handle_connection,
         "0.0.0.0",
-        8765
+        8765,
+        max_size=MAX_MESSAGE_SIZE,
+        ping_interval=PING_INTERVAL,
+        ping_timeout=PING_TIMEOUT
     )
+
+async def _serve_forever():
+    server = await start_collaboration_server()
+    await server.wait_closed()
+
+def run_collaboration_server():
+    """Run the collaboration server until stopped, on uvloop when it is installed"""
+    loop_factory = uvloop.new_event_loop if UVLOOP_AVAILABLE else None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(_serve_forever())
+
+if __name__ == "__main__":
+    run_collaboration_server()
@@ -1,13 +1,110 @@
 
+import asyncio
 import os
 import json
 import subprocess
 import time
-from typing import Dict, List, Optional
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
-from github import Github
+from github import Github, GithubException, InputGitTreeElement
 import requests
 from deployment_manager import DeploymentManager
+from migrate_to_github import git_blob_sha
+
+# GitHub's secondary rate limits punish bursts, so cap blob uploads in flight
+BLOB_UPLOAD_CONCURRENCY = 10
+
+# Deployment configuration files added to the migrated repository
+_DEPLOYMENT_FILES: Dict[str, str] = {
+    # Render deployment configuration
+    'render.yaml': '''services:
+  - type: web
+    name: clairedev-platform
+    env: python
+    buildCommand: pip install -r requirements.txt
+    startCommand: python main.py
+    envVars:
+      - key: PORT
+        value: "5000"
+      - key: PYTHONPATH
+        value: "."
+    healthCheckPath: /health
+''',
+    # Docker configuration
+    'Dockerfile': '''FROM python:3.11-slim
+
+WORKDIR /app
+
+COPY requirements.txt .
+RUN pip install -r requirements.txt
+
+COPY . .
+
+EXPOSE 5000
+
+CMD ["python", "main.py"]
+''',
+    # Heroku Procfile
+    'Procfile': 'web: python main.py',
+    # Updated requirements.txt with all dependencies
+    'requirements.txt': '''flask==2.3.3
+flask-cors==4.0.0
+openai==1.82.1
+PyGithub==1.59.1
+python-dotenv==1.0.0
+requests==2.31.0
+anthropic==0.42.0
+google-generativeai==0.3.0
+mistralai==0.4.2
+httpx==0.27.2
+asyncio-compat==0.1.0
+''',
+    # Environment template
+    '.env.production': '''# Production Environment Variables
+GITHUB_TOKEN=your_github_token_here
+OPENAI_API_KEY=your_openai_api_key_here
+ANTHROPIC_API_KEY=your_anthropic_api_key_here
+GEMINI_API_KEY=your_gemini_api_key_here
+MISTRAL_API_KEY=your_mistral_api_key_here
+DATABASE_URL=your_database_url_here
+PORT=5000
+''',
+    # GitHub Actions for CI/CD
+    '.github/workflows/deploy.yml': '''name: Deploy to Render
+
+on:
+  push:
+    branches: [ main ]
+
+jobs:
+  deploy:
+    runs-on: ubuntu-latest
+    steps:
+    - uses: actions/checkout@v2
+    
+    - name: Set up Python
+      uses: actions/setup-python@v2
+      with:
+        python-version: '3.11'
+    
+    - name: Install dependencies
+      run: |
+        python -m pip install --upgrade pip
+        pip install -r requirements.txt
+    
+    - name: Run tests
+      run: |
+        python -m pytest tests/ || echo "No tests found"
+    
+    - name: Deploy to Render
+      env:
+        RENDER_API_KEY: ${{ secrets.RENDER_API_KEY }}
+      run: |
+        echo "Deployment will be triggered automatically by Render"
+''',
+}
 
 @dataclass
 class MigrationPlan:
@@ -22,30 +119,83 @@ class SelfMigrationManager:
         self.github_token = github_token
         self.github = Github(github_token)
         self.deployment_manager = DeploymentManager(github_token)
-        self.current_codebase_files = self._get_current_files()
+        # path -> (mtime_ns, size, content); content is None for binary/unreadable files
+        self._file_cache: Dict[str, Tuple[int, int, Optional[str]]] = {}
+    
+    @property
+    def current_codebase_files(self) -> Dict[str, str]:
+        """Current project files, read on first use; later calls only re-read files that changed"""
+        return self._get_current_files()
     
     def _get_current_files(self) -> Dict[str, str]:
         """Get all current project files"""
-        files = {}
         exclude_dirs = {'.git', '__pycache__', '.env', 'node_modules', '.replit'}
         exclude_files = {'dev_studio.db', 'uv.lock', '.gitignore'}
         
-        for root, dirs, filenames in os.walk('.'):
-            # Remove excluded directories
-            dirs[:] = [d for d in dirs if d not in exclude_dirs]
-            
-            for filename in filenames:
-                if filename not in exclude_files and not filename.startswith('.'):
-                    file_path = os.path.join(root, filename)
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            relative_path = file_path[2:]  # Remove './'
-                            files[relative_path] = f.read()
-                    except (UnicodeDecodeError, PermissionError):
-                        continue
+        paths = []
+        pending = ['.']
+        while pending:
+            root = pending.pop()
+            subdirs = []
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    # Entry types come from readdir, so no extra stat per file
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in exclude_dirs:
+                            subdirs.append(entry.path)
+                    elif entry.is_file() and entry.name not in exclude_files and not entry.name.startswith('.'):
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        paths.append((entry.path, stat.st_mtime_ns, stat.st_size))
+            # Visit subdirectories in listing order, like os.walk
+            pending.extend(reversed(subdirs))
+        
+        # Only files that are new or changed since the last scan are read again
+        cache = {}
+        changed = []
+        for path, mtime, size in paths:
+            cached = self._file_cache.get(path)
+            if cached and cached[:2] == (mtime, size):
+                cache[path] = cached
+            else:
+                changed.append((path, mtime, size))
         
+        # Reads are I/O bound, so overlap them
+        if changed:
+            with ThreadPoolExecutor(max_workers=32) as executor:
+                contents = executor.map(self._read_text_file, [path for path, _, _ in changed])
+                for (path, mtime, size), content in zip(changed, contents):
+                    cache[path] = (mtime, size, content)
+        self._file_cache = cache
+        
+        files = {}
+        for path, _, _ in paths:
+            content = cache[path][2]
+            if content is not None:
+                files[path[2:]] = content  # Remove './'
         return files
     
+    @staticmethod
+    def _read_text_file(path: str) -> Optional[str]:
+        """Read a UTF-8 text file, or return None for binary and unreadable files"""
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        
+        # A NUL byte early on means binary; skip it without attempting a decode
+        if b'\0' in data[:4096]:
+            return None
+        try:
+            text = data.decode('utf-8')
+        except UnicodeDecodeError:
+            return None
+        # Same newline handling as reading in text mode
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+    
     def create_migration_plan(self, target_platform: str = "render") -> MigrationPlan:
         """Create a detailed migration plan"""
         steps = [
@@ -76,23 +226,30 @@ class SelfMigrationManager:
     
     def execute_self_migration(self, repo_name: str = "clairedev-platform") -> Dict[str, any]:
         """Execute complete self-migration to GitHub and deployment platform"""
+        return asyncio.run(self.execute_self_migration_async(repo_name))
+    
+    async def execute_self_migration_async(self, repo_name: str = "clairedev-platform") -> Dict[str, any]:
+        """Async self-migration; blocking GitHub calls and file reads run in threads so they overlap"""
         try:
             migration_log = []
             
-            # Step 1: Create GitHub repository
+            # Step 1: Create GitHub repository, reading the codebase meanwhile
             migration_log.append("Creating GitHub repository...")
-            repo = self._create_github_repo(repo_name)
+            repo, codebase_files = await asyncio.gather(
+                asyncio.to_thread(self._create_github_repo, repo_name),
+                asyncio.to_thread(self._get_current_files)
+            )
             
             # Step 2: Prepare deployment files
             migration_log.append("Preparing deployment configurations...")
             deployment_files = self._generate_deployment_files()
             
             # Step 3: Combine all files
-            all_files = {**self.current_codebase_files, **deployment_files}
+            all_files = {**codebase_files, **deployment_files}
             
             # Step 4: Upload to GitHub
             migration_log.append("Uploading codebase to GitHub...")
-            self._upload_to_github(repo_name, all_files)
+            await self._upload_to_github(repo_name, all_files)
             
             # Step 5: Generate deployment instructions
             migration_log.append("Generating deployment instructions...")
@@ -141,126 +298,58 @@ class SelfMigrationManager:
     
     def _generate_deployment_files(self) -> Dict[str, str]:
         """Generate deployment configuration files"""
-        files = {}
-        
-        # Render deployment configuration
-        files['render.yaml'] = '''services:
-  - type: web
-    name: clairedev-platform
-    env: python
-    buildCommand: pip install -r requirements.txt
-    startCommand: python main.py
-    envVars:
-      - key: PORT
-        value: "5000"
-      - key: PYTHONPATH
-        value: "."
-    healthCheckPath: /health
-'''
-        
-        # Docker configuration
-        files['Dockerfile'] = '''FROM python:3.11-slim
-
-WORKDIR /app
-
-COPY requirements.txt .
-RUN pip install -r requirements.txt
-
-COPY . .
-
-EXPOSE 5000
-
-CMD ["python", "main.py"]
-'''
-        
-        # Heroku Procfile
-        files['Procfile'] = 'web: python main.py'
+        return dict(_DEPLOYMENT_FILES)
+    
+    async def _upload_to_github(self, repo_name: str, files: Dict[str, str]):
+        """Upload all files to GitHub repository as a single commit"""
+        repo = await asyncio.to_thread(lambda: self.github.get_user().get_repo(repo_name))
+        base_commit, changed = await asyncio.to_thread(self._changed_files, repo, files)
+        if not changed:
+            print("All files already up to date")
+            return
         
-        # Updated requirements.txt with all dependencies
-        files['requirements.txt'] = '''flask==2.3.3
-flask-cors==4.0.0
-openai==1.3.0
-PyGithub==1.59.1
-python-dotenv==1.0.0
-requests==2.31.0
-anthropic==0.8.1
-google-generativeai==0.3.0
-mistralai==0.1.0
-asyncio-compat==0.1.0
-'''
+        # Blob uploads are independent, so send them concurrently
+        semaphore = asyncio.Semaphore(BLOB_UPLOAD_CONCURRENCY)
         
-        # Environment template
-        files['.env.production'] = '''# Production Environment Variables
-GITHUB_TOKEN=your_github_token_here
-OPENAI_API_KEY=your_openai_api_key_here
-ANTHROPIC_API_KEY=your_anthropic_api_key_here
-GEMINI_API_KEY=your_gemini_api_key_here
-MISTRAL_API_KEY=your_mistral_api_key_here
-DATABASE_URL=your_database_url_here
-PORT=5000
-'''
+        async def create_blob(content: str):
+            async with semaphore:
+                return await asyncio.to_thread(repo.create_git_blob, content, 'utf-8')
         
-        # GitHub Actions for CI/CD
-        files['.github/workflows/deploy.yml'] = '''name: Deploy to Render
-
-on:
-  push:
-    branches: [ main ]
-
-jobs:
-  deploy:
-    runs-on: ubuntu-latest
-    steps:
-    - uses: actions/checkout@v2
-    
-    - name: Set up Python
-      uses: actions/setup-python@v2
-      with:
-        python-version: '3.11'
+        blobs = await asyncio.gather(*(create_blob(content) for _, content in changed))
+        await asyncio.to_thread(self._commit_blobs, repo, base_commit, changed, blobs)
     
-    - name: Install dependencies
-      run: |
-        python -m pip install --upgrade pip
-        pip install -r requirements.txt
-    
-    - name: Run tests
-      run: |
-        python -m pytest tests/ || echo "No tests found"
-    
-    - name: Deploy to Render
-      env:
-        RENDER_API_KEY: ${{ secrets.RENDER_API_KEY }}
-      run: |
-        echo "Deployment will be triggered automatically by Render"
-'''
+    def _changed_files(self, repo, files: Dict[str, str]) -> Tuple[object, List[Tuple[str, str]]]:
+        """Return the branch head commit and the files whose content differs from it"""
+        branch_name = repo.default_branch
+        try:
+            branch = repo.get_branch(branch_name)
+        except GithubException as e:
+            if e.status not in (404, 409):
+                raise
+            # The Git Data API refuses empty repositories, so make the first commit through the contents API
+            first_path = next(iter(files))
+            repo.create_file(first_path, f"Add {first_path}", files[first_path])
+            branch = repo.get_branch(branch_name)
         
-        return files
-    
-    def _upload_to_github(self, repo_name: str, files: Dict[str, str]):
-        """Upload all files to GitHub repository"""
-        user = self.github.get_user()
-        repo = user.get_repo(repo_name)
+        base_commit = repo.get_git_commit(branch.commit.sha)
+        base_tree = repo.get_git_tree(base_commit.sha, recursive=True)
+        existing = {} if base_tree.raw_data.get('truncated') else {
+            entry.path: entry.sha for entry in base_tree.tree if entry.type == 'blob'
+        }
         
-        for file_path, content in files.items():
-            try:
-                # Try to get existing file
-                try:
-                    file = repo.get_contents(file_path)
-                    repo.update_file(
-                        file_path,
-                        f"Update {file_path}",
-                        content,
-                        file.sha
-                    )
-                except:
-                    # Create new file
-                    repo.create_file(
-                        file_path,
-                        f"Add {file_path}",
-                        content
-                    )
-            except Exception as e:
-                print(f"Failed to upload {file_path}: {e}")
+        # Files whose blob is already on the branch don't need uploading again
+        changed = [(path, content) for path, content in files.items()
+                   if existing.get(path) != git_blob_sha(content)]
+        return base_commit, changed
+    
+    def _commit_blobs(self, repo, base_commit, changed: List[Tuple[str, str]], blobs: List):
+        """Commit uploaded blobs on top of base_commit and move the default branch to it"""
+        tree = repo.create_git_tree(
+            [InputGitTreeElement(path, '100644', 'blob', sha=blob.sha) for (path, _), blob in zip(changed, blobs)],
+            base_tree=repo.get_git_tree(base_commit.tree.sha)
+        )
+        commit = repo.create_git_commit(f"Migrate {len(changed)} files", tree, [base_commit])
+        repo.get_git_ref(f"heads/{repo.default_branch}").edit(commit.sha)
     
     def _generate_deployment_guide(self, repo_url: str) -> str:
         """Generate step-by-step deployment guide"""
@@ -388,13 +477,14 @@ vercel --prod
     
     def _analyze_current_code(self) -> Dict[str, any]:
         """Analyze current codebase for metrics"""
-        total_files = len(self.current_codebase_files)
-        total_lines = sum(len(content.split('\n')) for content in self.current_codebase_files.values())
+        files = self.current_codebase_files
+        total_files = len(files)
+        # Count newlines in place rather than materializing every line; a final unterminated line still counts
+        total_lines = sum(content.count('\n') + (1 if content and not content.endswith('\n') else 0)
+                          for content in files.values())
         
-        file_types = {}
-        for filename in self.current_codebase_files.keys():
-            ext = filename.split('.')[-1] if '.' in filename else 'unknown'
-            file_types[ext] = file_types.get(ext, 0) + 1
+        file_types = dict(Counter(filename.rpartition('.')[2] if '.' in filename else 'unknown'
+                                  for filename in files))
         
         return {
             "total_files": total_files,
@@ -1,42 +1,35 @@
 
+import importlib
 import sys
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
-def test_imports():
-    """Test all imports to identify issues"""
-    tests = []
-    
-    try:
-        from database import DatabaseManager
-        tests.append(("DatabaseManager", True, "OK"))
-    except Exception as e:
-        tests.append(("DatabaseManager", False, str(e)))
-    
-    try:
-        from flask import Flask
-        tests.append(("Flask", True, "OK"))
-    except Exception as e:
-        tests.append(("Flask", False, str(e)))
-    
-    try:
-        import openai
-        tests.append(("OpenAI", True, "OK"))
-    except Exception as e:
-        tests.append(("OpenAI", False, str(e)))
-    
-    try:
-        from github import Github
-        tests.append(("GitHub", True, "OK"))
-    except Exception as e:
-        tests.append(("GitHub", False, str(e)))
-    
+# (label, module, attribute the app needs from it)
+IMPORT_CHECKS = [
+    ("DatabaseManager", "database", "DatabaseManager"),
+    ("Flask", "flask", "Flask"),
+    ("OpenAI", "openai", None),
+    ("GitHub", "github", "Github"),
+    ("SelfMigrationManager", "self_migration_manager", "SelfMigrationManager"),
+]
+
+def _check_import(module_name, attribute):
+    """Import a module (and attribute) and report (success, message)"""
     try:
-        from self_migration_manager import SelfMigrationManager
-        tests.append(("SelfMigrationManager", True, "OK"))
+        module = importlib.import_module(module_name)
+        if attribute:
+            getattr(module, attribute)
+        return True, "OK"
     except Exception as e:
-        tests.append(("SelfMigrationManager", False, str(e)))
-    
-    return tests
+        return False, str(e)
+
+def test_imports():
+    """Test all imports to identify issues"""
+    # Imports are mostly file I/O, so running them side by side takes about as long as the slowest one
+    with ThreadPoolExecutor(max_workers=len(IMPORT_CHECKS)) as executor:
+        futures = [executor.submit(_check_import, module_name, attribute)
+                   for _, module_name, attribute in IMPORT_CHECKS]
+        return [(name, *future.result()) for (name, _, _), future in zip(IMPORT_CHECKS, futures)]
 
 def test_database():
     """Test database initialization"""
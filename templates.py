@@ -1,4 +1,14 @@
 
+import gzip
+import os
+from typing import Optional, Tuple
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
 # Lightweight HTML template (reduced size)
 MINIMAL_TEMPLATE = """
 <!DOCTYPE html>
@@ -107,3 +117,36 @@ MINIMAL_TEMPLATE = """
 </body>
 </html>
 """
+
+# Set CLAIREDEV_DEBUG to serve the page exactly as written above
+DEBUG_TEMPLATES = bool(os.getenv('CLAIREDEV_DEBUG'))
+
+def _minify(html: str) -> str:
+    """Drop indentation and blank lines; line breaks stay so inline scripts keep their semicolon insertion"""
+    # Safe only while the page has no <pre>, <textarea> or multi-line string literals
+    return '\n'.join(line.strip() for line in html.splitlines() if line.strip())
+
+MINIMAL_TEMPLATE_MIN = MINIMAL_TEMPLATE if DEBUG_TEMPLATES else _minify(MINIMAL_TEMPLATE)
+
+# The page never changes, so encode and compress it once instead of per request
+_MINIMAL_TEMPLATE_BYTES = MINIMAL_TEMPLATE_MIN.encode('utf-8')
+MINIMAL_TEMPLATE_GZIP = gzip.compress(_MINIMAL_TEMPLATE_BYTES, 9, mtime=0)
+MINIMAL_TEMPLATE_BROTLI = brotli.compress(_MINIMAL_TEMPLATE_BYTES, quality=11) if BROTLI_AVAILABLE else None
+
+def _accepted_encodings(accept_encoding: str) -> set:
+    """Codings named in an Accept-Encoding header, leaving out any refused with q=0"""
+    accepted = set()
+    for item in accept_encoding.lower().split(','):
+        coding, _, params = item.partition(';')
+        if params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            accepted.add(coding.strip())
+    return accepted
+
+def get_minimal_template(accept_encoding: str = '') -> Tuple[bytes, Optional[str]]:
+    """Return the page body and its Content-Encoding (None for identity), preferring br, then gzip"""
+    accepted = _accepted_encodings(accept_encoding)
+    if MINIMAL_TEMPLATE_BROTLI is not None and 'br' in accepted:
+        return MINIMAL_TEMPLATE_BROTLI, 'br'
+    if 'gzip' in accepted:
+        return MINIMAL_TEMPLATE_GZIP, 'gzip'
+    return _MINIMAL_TEMPLATE_BYTES, None
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+for _module in ("openai", "anthropic", "httpx", "google.generativeai", "mistralai.async_client"):
+    pytest.importorskip(_module)
+
+import multi_ai_manager
+from cache_manager import SemanticCache
+from multi_ai_manager import AIProvider, AIResponse, AITask
+
+# The module rebinds MultiAIManager to placeholder classes further down;
+# the full manager is the one CollaborativeCodeGenerator is typed against
+FullMultiAIManager = multi_ai_manager.CollaborativeCodeGenerator.__init__.__annotations__['multi_ai_manager']
+
+
+def _manager(embed_calls):
+    async def embed(texts):
+        embed_calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    async def query(provider, task, on_text=None):
+        return AIResponse(provider=provider, content=f"{provider.value}: {task.description}",
+                          confidence=0.9, reasoning="", execution_time=0.1, tokens_used=1)
+
+    manager = FullMultiAIManager({})
+    manager.clients = {AIProvider.OPENAI: object(), AIProvider.ANTHROPIC: object(), AIProvider.MISTRAL: object()}
+    manager.response_cache = SemanticCache(embed_fn=embed)
+    manager._query_provider = query
+    return manager
+
+
+def test_consensus_tasks_share_one_batched_embedding_call():
+    embed_calls = []
+    manager = _manager(embed_calls)
+    tasks = [AITask("consensus_question", f"Question {i}?", {}) for i in range(5)]
+
+    results = asyncio.run(manager._execute_consensus_tasks(tasks))
+
+    assert len(embed_calls) == 1
+    assert sorted(embed_calls[0]) == sorted(f"Question {i}?\n\n{tasks[i].context_json}" for i in range(5))
+    assert [list(result) for result in results] == [list(manager.clients)] * 5
+    assert results[2][AIProvider.ANTHROPIC].content == "anthropic: Question 2?"
+
+
+def test_generation_tasks_are_not_embedded():
+    embed_calls = []
+    manager = _manager(embed_calls)
+    tasks = [AITask("backend_code", "Generate backend services", {"architecture": "a"})]
+
+    asyncio.run(manager._execute_parallel_tasks(tasks))
+
+    assert embed_calls == []